@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-import re
+from dataclasses import dataclass, field
+import logging
+import sys
 from pathlib import Path
-from typing import Any, Literal
+from typing import TYPE_CHECKING, Any, Literal
 
-import yaml
+if TYPE_CHECKING:
+    from .layout import UserLayout
 
 
 class ConfigError(Exception):
@@ -17,8 +19,16 @@ class ConfigError(Exception):
 IconPosition = Literal["top-right", "top-left", "bottom-right", "bottom-left"]
 LayoutMode = Literal["simple"]  # smart mode intentionally deferred
 
-
-_SNOWFLAKE_RE = re.compile(r"^[0-9]{17,20}$")
+_ICON_POS_VALUES: frozenset[str] = frozenset(("top-right", "top-left", "bottom-right", "bottom-left"))
+_LAYOUT_MODES: frozenset[str] = frozenset(("simple",))
+_EXPECTED_SLOTS: dict[str, int] = {f"slot_{i}": i for i in range(1, 7)}
+_LOG_LEVELS: dict[str, int] = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
 
 
 def _require_mapping(obj: Any, where: str) -> dict[str, Any]:
@@ -51,18 +61,31 @@ def _require_number(obj: Any, where: str) -> float:
     return float(obj)
 
 
-def _optional_path(obj: Any, where: str, base_dir: Path) -> Path | None:
+def _optional_path(
+    obj: Any, where: str, base_dir: Path, path_cache: dict[str, Path] | None = None
+) -> Path | None:
     if obj is None:
         return None
     s = _require_str(obj, where)
-    p = Path(s)
-    if not p.is_absolute():
-        p = (base_dir / p).resolve()
-    return p
-
-
-def _required_path(obj: Any, where: str, base_dir: Path) -> Path:
-    p = _optional_path(obj, where, base_dir)
+    if path_cache is None:
+        p = Path(s)
+        return p if p.is_absolute() else (base_dir / p).resolve()
+
+    # Users commonly share assets: resolve() walks the filesystem, so do it once per spelling,
+    # and intern by the final path so every reference to one asset shares a single Path.
+    cached = path_cache.get(s)
+    if cached is None:
+        p = Path(s)
+        if not p.is_absolute():
+            p = (base_dir / p).resolve()
+        cached = path_cache[s] = path_cache.setdefault(str(p), p)
+    return cached
+
+
+def _required_path(
+    obj: Any, where: str, base_dir: Path, path_cache: dict[str, Path] | None = None
+) -> Path:
+    p = _optional_path(obj, where, base_dir, path_cache)
     if p is None:
         raise ConfigError([f"{where} is required"])
     return p
@@ -74,26 +97,27 @@ def _parse_snowflake(obj: Any, where: str) -> int:
             raise ConfigError([f"{where} must be > 0"])
         return obj
     s = _require_str(obj, where)
-    if not _SNOWFLAKE_RE.match(s):
+    # ASCII-only: str.isdigit() alone would also accept e.g. Arabic-Indic digits.
+    if not (17 <= len(s) <= 20 and s.isascii() and s.isdigit()):
         raise ConfigError([f"{where} must be a Discord snowflake (17-20 digits)"])
     return int(s)
 
 
 def _parse_icon_position(obj: Any, where: str) -> IconPosition:
     s = _require_str(obj, where)
-    if s not in ("top-right", "top-left", "bottom-right", "bottom-left"):
+    if s not in _ICON_POS_VALUES:
         raise ConfigError([f"{where} must be one of: top-right, top-left, bottom-right, bottom-left"])
     return s  # type: ignore[return-value]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DiscordConfig:
     bot_token: str
     guild_id: int
     voice_channel_id: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ObsConfig:
     websocket_host: str
     websocket_port: int
@@ -101,7 +125,7 @@ class ObsConfig:
     scene_name: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class UserConfig:
     discord_id: int
     name: str
@@ -113,20 +137,20 @@ class UserConfig:
     custom_deaf_icon: Path | None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LayoutConfig:
     mode: LayoutMode
     positions: dict[int, tuple[int, int]]  # slot -> (x, y)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class IconsConfig:
     mute_default: Path
     deaf_default: Path
     size: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AdvancedConfig:
     animation_duration: float
     reconnect_attempts: int
@@ -136,8 +160,13 @@ class AdvancedConfig:
     talking_hangover_ms: int
     talking_while_muted: bool
 
+    log_level_int: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "log_level_int", _LOG_LEVELS.get(self.log_level.upper(), logging.INFO))
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AppConfig:
     config_path: Path
     discord: DiscordConfig
@@ -146,24 +175,72 @@ class AppConfig:
     layout: LayoutConfig
     icons: IconsConfig
     advanced: AdvancedConfig
+    user_index: dict[int, int] = field(init=False, repr=False, compare=False)  # discord_id -> position in users
+    # Filled once by load_config(); see _finalize_layout().
+    layout_by_user: dict[int, UserLayout] = field(init=False, repr=False, compare=False, default_factory=dict)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "user_index", {u.discord_id: i for i, u in enumerate(self.users)})
 
     @property
     def base_dir(self) -> Path:
         return self.config_path.parent
 
 
+def default_config_path() -> Path:
+    # When bundled with PyInstaller, default to config.yaml next to the EXE.
+    if getattr(sys, "frozen", False):
+        return Path(sys.executable).resolve().with_name("config.yaml")
+    return Path("config.yaml").resolve()
+
+
+def _yaml_safe_loader() -> type:
+    # Imported lazily, alongside PyYAML itself in _parse_config.
+    try:  # LibYAML bindings are much faster; not every PyYAML wheel ships them.
+        from yaml import CSafeLoader as loader
+    except ImportError:  # pragma: no cover - depends on how PyYAML was built
+        from yaml import SafeLoader as loader  # type: ignore[assignment]
+    return loader
+
+
 def load_config(path: str | Path) -> AppConfig:
+    """Load and validate `config.yaml`."""
     config_path = Path(path).resolve()
+    cfg = _parse_config(config_path)
+    _finalize_layout(cfg)
+    return cfg
+
+
+def _finalize_layout(cfg: AppConfig) -> None:
+    """Assign slots and compute per-user layouts once, so runtime code only does dict lookups."""
+    from .layout import assign_slots, compute_user_layout, prefetch_image_sizes
+
+    try:
+        slots = assign_slots(cfg.users)
+    except ValueError as e:
+        raise ConfigError([str(e)])
+
+    prefetch_image_sizes(u.idle_animation for u in cfg.users)
+    for u in cfg.users:
+        cfg.layout_by_user[u.discord_id] = compute_user_layout(
+            user=u, slot=slots[u.discord_id], layout=cfg.layout, icon_size=cfg.icons.size
+        )
+
+
+def _parse_config(config_path: Path) -> AppConfig:
     base_dir = config_path.parent
     errors: list[str] = []
+    path_cache: dict[str, Path] = {}
 
     try:
-        raw_text = config_path.read_text(encoding="utf-8")
+        raw_bytes = config_path.read_bytes()
     except FileNotFoundError:
         raise ConfigError([f"Config file not found: {config_path}"])
 
     try:
-        raw = yaml.safe_load(raw_text) or {}
+        import yaml
+
+        raw = yaml.load(raw_bytes, Loader=_yaml_safe_loader()) or {}
     except Exception as e:  # pragma: no cover - depends on yaml parser internals
         raise ConfigError([f"Failed to parse YAML: {e}"])
 
@@ -207,32 +284,29 @@ def load_config(path: str | Path) -> AppConfig:
     )
 
     mode = layout_raw.get("mode", "simple")
-    if mode != "simple":
+    if not isinstance(mode, str) or mode not in _LAYOUT_MODES:
         errors.append("layout.mode must be 'simple' for MVP")
         mode = "simple"
 
     positions_raw = collect(_require_mapping, layout_raw.get("positions"), "layout.positions") or {}
     positions: dict[int, tuple[int, int]] = {}
-    for slot in range(1, 7):
-        key = f"slot_{slot}"
-        val = positions_raw.get(key)
-        where = f"layout.positions.{key}"
-        if val is None:
-            errors.append(f"{where} is required")
-            continue
-        if (
-            not isinstance(val, (list, tuple))
-            or len(val) != 2
-            or not isinstance(val[0], (int, float))
-            or not isinstance(val[1], (int, float))
-        ):
-            errors.append(f"{where} must be [x, y] numbers")
-            continue
-        positions[slot] = (int(val[0]), int(val[1]))
+    for key, val in positions_raw.items():
+        slot = _EXPECTED_SLOTS.get(key)
+        if slot is None or val is None:
+            continue  # unknown keys are ignored; missing/null slots are reported below
+        if isinstance(val, (list, tuple)) and len(val) == 2:
+            x, y = val
+            if isinstance(x, (int, float)) and isinstance(y, (int, float)):
+                positions[slot] = (int(x), int(y))
+                continue
+        errors.append(f"layout.positions.{key} must be [x, y] numbers")
+    for key in _EXPECTED_SLOTS:
+        if positions_raw.get(key) is None:
+            errors.append(f"layout.positions.{key} is required")
     layout_cfg = LayoutConfig(mode=mode, positions=positions)
 
-    mute_default = collect(_required_path, icons_raw.get("mute_default"), "icons.mute_default", base_dir)
-    deaf_default = collect(_required_path, icons_raw.get("deaf_default"), "icons.deaf_default", base_dir)
+    mute_default = collect(_required_path, icons_raw.get("mute_default"), "icons.mute_default", base_dir, path_cache)
+    deaf_default = collect(_required_path, icons_raw.get("deaf_default"), "icons.deaf_default", base_dir, path_cache)
     size = collect(_require_int, icons_raw.get("size"), "icons.size") or 64
     icons_cfg = IconsConfig(
         mute_default=mute_default or (base_dir / "assets/icons/default_mute.png").resolve(),
@@ -246,6 +320,9 @@ def load_config(path: str | Path) -> AppConfig:
     if not isinstance(log_level, str):
         errors.append("advanced.log_level must be a string")
         log_level = "INFO"
+    elif log_level.upper() not in _LOG_LEVELS:
+        errors.append(f"advanced.log_level must be one of: {', '.join(_LOG_LEVELS)}")
+        log_level = "INFO"
 
     talking_threshold = collect(_require_number, advanced_raw.get("talking_threshold"), "advanced.talking_threshold") or 0.02
     talking_hangover_ms = collect(_require_int, advanced_raw.get("talking_hangover_ms"), "advanced.talking_hangover_ms") or 300
@@ -284,9 +361,9 @@ def load_config(path: str | Path) -> AppConfig:
         seen_ids.add(u_discord_id)
 
         name = collect(_require_str, u_raw.get("name"), f"{where}.name") or str(u_discord_id)
-        idle_animation = collect(_required_path, u_raw.get("idle_animation"), f"{where}.idle_animation", base_dir)
+        idle_animation = collect(_required_path, u_raw.get("idle_animation"), f"{where}.idle_animation", base_dir, path_cache)
         talking_animation = collect(
-            _required_path, u_raw.get("talking_animation"), f"{where}.talking_animation", base_dir
+            _required_path, u_raw.get("talking_animation"), f"{where}.talking_animation", base_dir, path_cache
         )
 
         slot = u_raw.get("position_slot", None)
@@ -304,8 +381,8 @@ def load_config(path: str | Path) -> AppConfig:
                 position_slot = None
 
         icon_position = collect(_parse_icon_position, u_raw.get("icon_position", "top-right"), f"{where}.icon_position")
-        custom_mute_icon = collect(_optional_path, u_raw.get("custom_mute_icon"), f"{where}.custom_mute_icon", base_dir)
-        custom_deaf_icon = collect(_optional_path, u_raw.get("custom_deaf_icon"), f"{where}.custom_deaf_icon", base_dir)
+        custom_mute_icon = collect(_optional_path, u_raw.get("custom_mute_icon"), f"{where}.custom_mute_icon", base_dir, path_cache)
+        custom_deaf_icon = collect(_optional_path, u_raw.get("custom_deaf_icon"), f"{where}.custom_deaf_icon", base_dir, path_cache)
 
         users.append(
             UserConfig(
@@ -10,18 +10,22 @@ import discord
 log = logging.getLogger(__name__)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class VoicePresenceChange:
     user_id: int
     joined: bool  # True=joined target channel, False=left target channel
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class VoiceMuteDeafState:
     user_id: int
     muted: bool
     deafened: bool
 
+    @classmethod
+    def from_bits(cls, user_id: int, bits: int) -> VoiceMuteDeafState:
+        return cls(user_id=user_id, muted=bool(bits & MUTED_BIT), deafened=bool(bits & DEAFENED_BIT))
+
 
 PresenceCallback = Callable[[VoicePresenceChange], Awaitable[None]]
 MuteDeafCallback = Callable[[VoiceMuteDeafState], Awaitable[None]]
@@ -37,13 +41,21 @@ def _is_deafened(vs: discord.VoiceState) -> bool:
     return bool(vs.self_deaf or vs.deaf)
 
 
+MUTED_BIT = 1
+DEAFENED_BIT = 2
+
+
+def _mute_deaf_bits(vs: discord.VoiceState) -> int:
+    return (MUTED_BIT if _is_muted(vs) else 0) | (DEAFENED_BIT if _is_deafened(vs) else 0)
+
+
 class PNGTuberDiscordClient(discord.Client):
     def __init__(
         self,
         *,
         guild_id: int,
         voice_channel_id: int,
-        tracked_user_ids: set[int],
+        tracked_user_ids: set[int] | frozenset[int],
         on_presence_change: PresenceCallback,
         on_mute_deaf_change: MuteDeafCallback,
         on_ready_hook: Optional[Callable[["PNGTuberDiscordClient"], Awaitable[None]]] = None,
@@ -56,13 +68,13 @@ class PNGTuberDiscordClient(discord.Client):
         super().__init__(intents=intents)
         self.guild_id = int(guild_id)
         self.voice_channel_id = int(voice_channel_id)
-        self.tracked_user_ids = tracked_user_ids
+        self.tracked_user_ids = frozenset(tracked_user_ids)
         self.on_presence_change_cb = on_presence_change
         self.on_mute_deaf_change_cb = on_mute_deaf_change
         self.on_ready_hook = on_ready_hook
 
-        # Cache last known mute/deaf to avoid duplicate callbacks.
-        self._mute_deaf_cache: dict[int, tuple[bool, bool]] = {}
+        # Cache last known mute/deaf (as `_mute_deaf_bits`) to avoid duplicate callbacks.
+        self._mute_deaf_cache: dict[int, int] = {}
 
     async def on_ready(self) -> None:
         log.info("Discord connected as %s (id=%s)", self.user, getattr(self.user, "id", "?"))
@@ -81,19 +93,18 @@ class PNGTuberDiscordClient(discord.Client):
             log.error("Configured voice_channel_id is not a voice/stage channel: %s", self.voice_channel_id)
             return
 
-        # Initialize state for users already present.
-        for member in list(channel.members):
-            if member.id not in self.tracked_user_ids:
+        # Initialize state for users already present (scales with tracked users, not channel size).
+        for user_id in self.tracked_user_ids:
+            member = guild.get_member(user_id)
+            if member is None or member.voice is None or member.voice.channel is None:
+                continue
+            if member.voice.channel.id != self.voice_channel_id:
                 continue
             await self.on_presence_change_cb(VoicePresenceChange(user_id=member.id, joined=True))
 
-            if member.voice:
-                muted = _is_muted(member.voice)
-                deafened = _is_deafened(member.voice)
-                self._mute_deaf_cache[member.id] = (muted, deafened)
-                await self.on_mute_deaf_change_cb(
-                    VoiceMuteDeafState(user_id=member.id, muted=muted, deafened=deafened)
-                )
+            bits = _mute_deaf_bits(member.voice)
+            self._mute_deaf_cache[member.id] = bits
+            await self.on_mute_deaf_change_cb(VoiceMuteDeafState.from_bits(member.id, bits))
 
         if self.on_ready_hook is not None:
             await self.on_ready_hook(self)
@@ -123,13 +134,10 @@ class PNGTuberDiscordClient(discord.Client):
         if not is_in_target:
             return
 
-        muted = _is_muted(after)
-        deafened = _is_deafened(after)
-
-        prev = self._mute_deaf_cache.get(member.id)
-        cur = (muted, deafened)
-        if prev != cur:
+        # Compare packed bits first; the state object is only built when something changed.
+        cur = _mute_deaf_bits(after)
+        if self._mute_deaf_cache.get(member.id, -1) != cur:
             self._mute_deaf_cache[member.id] = cur
-            await self.on_mute_deaf_change_cb(VoiceMuteDeafState(user_id=member.id, muted=muted, deafened=deafened))
+            await self.on_mute_deaf_change_cb(VoiceMuteDeafState.from_bits(member.id, cur))
 
 
@@ -1,18 +1,77 @@
 from __future__ import annotations
 
+import json
 import logging
+import os
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-
-from PIL import Image
+from typing import Iterable
 
 from .config import IconPosition, LayoutConfig, UserConfig
 
 
 log = logging.getLogger(__name__)
 
+# Populated by prefetch_image_sizes() and image_size(); consulted first by image_size().
+_image_sizes: dict[Path, tuple[int, int]] = {}
+
+
+def _size_cache_path() -> Path:
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "pngtuberbot" / "imgsize.json"
+
+
+# Persistent image-size cache: abs path -> [mtime_ns, size, w, h]. Loaded lazily, saved by
+# save_image_size_cache() (the bot registers it at exit).
+# Only paths looked up by this process are written back, so entries for images that are no
+# longer configured (or deleted) drop out on the next save.
+_disk_sizes: dict[str, list[int]] | None = None
+_disk_sizes_dirty = False
+_disk_sizes_used: set[str] = set()
+_disk_sizes_lock = threading.Lock()
+
+
+def _load_disk_sizes() -> dict[str, list[int]]:
+    global _disk_sizes
+    with _disk_sizes_lock:
+        if _disk_sizes is None:
+            try:
+                data = json.loads(_size_cache_path().read_bytes())
+                _disk_sizes = data if isinstance(data, dict) else {}
+            except Exception:
+                _disk_sizes = {}
+        return _disk_sizes
+
+
+def save_image_size_cache() -> None:
+    """Write the image sizes looked up by this process back to the on-disk cache (if changed)."""
+    if _disk_sizes is None:
+        return
+    keep = {k: v for k, v in _disk_sizes.items() if k in _disk_sizes_used}
+    if not _disk_sizes_dirty and len(keep) == len(_disk_sizes):
+        return
+    path = _size_cache_path()
+    # Write a private temp file and swap it in, so a kill mid-write or a second bot instance
+    # saving at the same time can't leave a torn file behind.
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(keep, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError as e:
+        log.debug("Could not write image size cache: %s", e)
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class UserLayout:
     user_id: int
     slot: int
@@ -63,12 +122,89 @@ def assign_slots(users: list[UserConfig]) -> dict[int, int]:
     return out
 
 
-def _get_image_size(path: Path) -> tuple[int, int]:
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _parse_image_header(path: Path) -> tuple[int, int]:
+    """
+    Read width/height straight from the file header for PNG/GIF; other formats go through PIL.
+    """
+    with open(path, "rb") as f:
+        head = f.read(24)
+    # PNG: signature, then the IHDR chunk with big-endian width/height at bytes 16-23.
+    if head[:8] == _PNG_SIGNATURE and head[12:16] == b"IHDR":
+        w, h = struct.unpack(">II", head[16:24])
+        return int(w), int(h)
+    # GIF: logical screen width/height as little-endian uint16 at bytes 6-9.
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        w, h = struct.unpack("<HH", head[6:10])
+        return int(w), int(h)
+
+    from PIL import Image  # deferred: only needed for uncommon formats
+
+    with Image.open(path) as im:
+        return int(im.size[0]), int(im.size[1])
+
+
+def _read_image_size(path: Path) -> tuple[int, int]:
+    global _disk_sizes_dirty
     try:
-        with Image.open(path) as im:
-            return int(im.size[0]), int(im.size[1])
+        st = os.stat(path)
+    except OSError:
+        return 0, 0
+
+    key = str(path)
+    disk = _load_disk_sizes()
+    _disk_sizes_used.add(key)
+    hit = disk.get(key)
+    if isinstance(hit, list) and len(hit) == 4 and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+        return int(hit[2]), int(hit[3])
+
+    try:
+        w, h = _parse_image_header(path)
     except Exception:
-        return 200, 200
+        return 0, 0
+
+    disk[key] = [st.st_mtime_ns, st.st_size, w, h]
+    _disk_sizes_dirty = True
+    return w, h
+
+
+def image_size(path: Path) -> tuple[int, int]:
+    """Width/height of the image at `path`, or (0, 0) if it can't be read. Cached per path."""
+    size = _image_sizes.get(path)
+    if size is None:
+        size = _image_sizes[path] = _read_image_size(path)
+    return size
+
+
+def prefetch_image_sizes(paths: Iterable[Path]) -> dict[Path, tuple[int, int]]:
+    """
+    Read image sizes for all `paths` concurrently (header reads are IO-bound).
+
+    Results are remembered, so later `compute_user_layout` calls don't touch the disk.
+    """
+    todo = [p for p in dict.fromkeys(paths) if p not in _image_sizes]
+    if todo:
+        with ThreadPoolExecutor(max_workers=min(8, len(todo))) as pool:
+            _image_sizes.update(zip(todo, pool.map(_read_image_size, todo)))
+    return dict(_image_sizes)
+
+
+# icon_position -> (stack direction, is_left, is_top); positions are validated by config.
+_ICON_POS_TABLE: dict[str, tuple[int, bool, bool]] = {
+    "top-left": (1, True, True),
+    "top-right": (1, False, True),
+    "bottom-left": (-1, True, False),
+    "bottom-right": (-1, False, False),
+}
+
+
+@lru_cache(maxsize=8)
+def _anchor_offsets(icon_size: int) -> dict[str, tuple[tuple[int, int], tuple[int, int]]]:
+    """Per-corner (dx, dy) offsets for stack index 0 and 1; icon size is fixed per config."""
+    step = icon_size + 2
+    return {pos: ((0, 0), (0, sign * step)) for pos, (sign, _, _) in _ICON_POS_TABLE.items()}
 
 
 def _icon_anchor(
@@ -88,21 +224,10 @@ def _icon_anchor(
     - top corners: stack down
     - bottom corners: stack up
     """
-    if icon_position.startswith("top"):
-        dy = stack_index * (icon_size + 2)
-    else:
-        dy = -stack_index * (icon_size + 2)
-
-    if icon_position.endswith("left"):
-        x = avatar_x
-    else:
-        x = avatar_x + max(0, avatar_w - icon_size)
-
-    if icon_position.startswith("top"):
-        y = avatar_y + dy
-    else:
-        y = avatar_y + max(0, avatar_h - icon_size) + dy
-
+    _, is_left, is_top = _ICON_POS_TABLE[icon_position]
+    dx, dy = _anchor_offsets(icon_size)[icon_position][stack_index]
+    x = avatar_x + dx + (0 if is_left else max(0, avatar_w - icon_size))
+    y = avatar_y + dy + (0 if is_top else max(0, avatar_h - icon_size))
     return int(x), int(y)
 
 
@@ -117,7 +242,9 @@ def compute_user_layout(
         raise ValueError(f"Missing position for slot_{slot}")
 
     avatar_x, avatar_y = layout.positions[slot]
-    avatar_w, avatar_h = _get_image_size(user.idle_animation)
+    avatar_w, avatar_h = image_size(user.idle_animation)
+    if not avatar_w or not avatar_h:
+        avatar_w, avatar_h = 200, 200
 
     mute_x, mute_y = _icon_anchor(
         avatar_x=avatar_x,
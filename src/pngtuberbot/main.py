@@ -1,18 +1,11 @@
 import argparse
 import asyncio
+import atexit
 import logging
 from pathlib import Path
-import sys
 
-from pngtuberbot.config import ConfigError, load_config
-from pngtuberbot.state import PNGTuberBotRuntime
-
-
-def _default_config_path() -> Path:
-    # When bundled with PyInstaller, default to config.yaml next to the EXE.
-    if getattr(sys, "frozen", False):
-        return Path(sys.executable).resolve().with_name("config.yaml")
-    return Path("config.yaml").resolve()
+from pngtuberbot.config import ConfigError, default_config_path, load_config
+from pngtuberbot.layout import save_image_size_cache
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -24,27 +17,33 @@ def main(argv: list[str] | None = None) -> int:
     )
     args = parser.parse_args(argv)
 
-    config_path = Path(args.config).resolve() if args.config else _default_config_path()
+    config_path = Path(args.config).resolve() if args.config else default_config_path()
 
+    # Configure the handler once; later steps only adjust the level/format in place.
     log = logging.getLogger("pngtuberbot")
     logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    root = logging.getLogger()
     log.info("Starting PNGTuberBot (config=%s)", config_path)
 
+    # Image sizes read while loading the config (and laying out icons) are kept for next start.
+    atexit.register(save_image_size_cache)
     try:
         cfg = load_config(config_path)
     except ConfigError as ce:
-        logging.basicConfig(level=logging.INFO, format="%(message)s", force=True)
+        plain = logging.Formatter("%(message)s")
+        for handler in root.handlers:
+            handler.setFormatter(plain)
         for err in ce.errors:
             log.error("Config error: %s", err)
         return 2
 
-    logging.basicConfig(
-        level=getattr(logging, cfg.advanced.log_level.upper(), logging.INFO),
-        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
-        force=True,
-    )
+    root.setLevel(cfg.advanced.log_level_int)
     log.info("Config loaded OK. Launching runtime...")
 
+    # Imported late: discord.py / voice_recv / simpleobsws are slow to import, and `--help`
+    # or a bad config shouldn't pay for them.
+    from pngtuberbot.state import PNGTuberBotRuntime
+
     runtime = PNGTuberBotRuntime(cfg)
     try:
         asyncio.run(runtime.run())
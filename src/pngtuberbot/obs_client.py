@@ -4,19 +4,32 @@ import asyncio
 import logging
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Awaitable, Callable, TypeVar
 
 import simpleobsws
 
 
 log = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
 
 class ObsError(RuntimeError):
     pass
 
 
-@dataclass(frozen=True)
+# We use Color Correction filter ("color_filter") because it exposes an opacity control.
+_OPACITY_FILTER_KIND = "color_filter"
+_OPACITY_FILTER_NAME = "PNGTuberBotOpacity"
+
+# Upper bound on coalesced SetSourceFilterSettings requests per RequestBatch.
+_MAX_OPACITY_BATCH = 64
+
+# Every batch we send must run in order (opacity before visibility, frames before Sleep).
+_SERIAL = simpleobsws.RequestBatchExecutionType.SerialRealtime
+
+
+@dataclass(frozen=True, slots=True)
 class OpacityFilterSpec:
     filter_name: str
     filter_kind: str
@@ -24,6 +37,14 @@ class OpacityFilterSpec:
     max_opacity: float
 
 
+@dataclass(frozen=True, slots=True)
+class ImageSourceSpec:
+    scene_name: str
+    source_name: str
+    file_path: Path
+    enabled: bool
+
+
 @dataclass
 class SceneItemHandle:
     scene_name: str
@@ -31,6 +52,17 @@ class SceneItemHandle:
     scene_item_id: int
 
 
+async def _sleep_until(loop: asyncio.AbstractEventLoop, deadline: float) -> None:
+    delay = deadline - loop.time()
+    if delay > 0:
+        await asyncio.sleep(delay)
+
+
+def _replayable(requests: list[simpleobsws.Request]) -> bool:
+    """Get*/Set* (and Sleep) can safely be resent after a reconnect; Create*/Remove* and friends can't."""
+    return all(r.requestType.startswith(("Get", "Set")) or r.requestType == "Sleep" for r in requests)
+
+
 class ObsClient:
     """
     Minimal OBS WebSocket v5 wrapper (async) using simpleobsws.
@@ -40,20 +72,48 @@ class ObsClient:
       opacity changes affect all scenes. MVP uses a single scene to avoid surprises.
     """
 
-    def __init__(self, host: str, port: int, password: str) -> None:
+    def __init__(self, host: str, port: int, password: str, *, reconnect_attempts: int = 3) -> None:
         self._url = f"ws://{host}:{port}"
         self._password = password or ""
         self._ws: simpleobsws.WebSocketClient | None = None
-        self._opacity_filter_cache: dict[str, OpacityFilterSpec] = {}
+        # Set by connect(), cleared by disconnect(): whether a missing socket should be reconnected.
+        self._want_connected = False
+        self._reconnect_attempts = max(0, int(reconnect_attempts))
+        self._reconnect_lock = asyncio.Lock()
+        # Filter defaults depend only on the filter kind, so resolve them once per kind.
+        self._spec_by_kind: dict[str, OpacityFilterSpec] = {}
+        self._spec_lock = asyncio.Lock()
+        # Discovery caches so steady-state calls skip GetSceneItemId / GetSourceFilterList.
+        self._scene_item_ids: dict[tuple[str, str], int] = {}  # (scene, source) -> sceneItemId
+        self._filter_present: set[tuple[str, str]] = set()  # (source, filter name)
+
+        # set_opacity() calls issued in the same loop iteration are flushed as one RequestBatch.
+        self._pending_opacity: list[tuple[simpleobsws.Request, asyncio.Future[None]]] = []
+        self._opacity_flush_task: asyncio.Task[None] | None = None
 
     async def connect(self) -> None:
-        if self._ws and self._ws.ws_open:
+        if self._ws and self._ws.ws_open and self._ws.is_identified():
             return
-        self._ws = simpleobsws.WebSocketClient(url=self._url, password=self._password)
-        await self._ws.connect()
-        ok = await self._ws.wait_until_identified(timeout=10)
-        if not ok:
-            raise ObsError("Failed to identify with OBS WebSocket (timeout)")
+        self._want_connected = True
+        # We never consume OBS events, so don't subscribe to any (less traffic on the socket).
+        ws = simpleobsws.WebSocketClient(
+            url=self._url,
+            password=self._password,
+            identification_parameters=simpleobsws.IdentificationParameters(eventSubscriptions=0),
+        )
+        self._ws = ws
+        try:
+            await ws.connect()
+            if not await ws.wait_until_identified(timeout=10):
+                raise ObsError("Failed to identify with OBS WebSocket (timeout)")
+        except BaseException:
+            # Never leave an open but unidentified socket behind: it would pass for connected.
+            self._ws = None
+            try:
+                await ws.disconnect()
+            except Exception:
+                pass
+            raise
         log.info("Connected to OBS (%s)", self._url)
 
     async def get_version(self) -> dict[str, Any]:
@@ -61,24 +121,133 @@ class ObsClient:
         return await self._call("GetVersion")
 
     async def disconnect(self) -> None:
+        self._want_connected = False
+        if self._opacity_flush_task:
+            self._opacity_flush_task.cancel()
+            self._opacity_flush_task = None
+        pending, self._pending_opacity = self._pending_opacity, []
+        self._fail_opacity(pending, ObsError("OBS client disconnected"))
+        self._scene_item_ids.clear()
+        self._filter_present.clear()
         if self._ws:
             await self._ws.disconnect()
             self._ws = None
 
+    def invalidate_source(self, source_name: str) -> None:
+        """Forget cached scene item ids / filter state for a source (e.g. it was edited in OBS)."""
+        for key in [k for k in self._scene_item_ids if k[1] == source_name]:
+            del self._scene_item_ids[key]
+        self._filter_present = {k for k in self._filter_present if k[0] != source_name}
+
     def _require_ws(self) -> simpleobsws.WebSocketClient:
         if not self._ws:
             raise ObsError("OBS client not connected")
         return self._ws
 
+    async def _reconnect(self, failed_ws: simpleobsws.WebSocketClient | None) -> None:
+        async with self._reconnect_lock:
+            ws = self._ws
+            if ws is not failed_ws and ws is not None and ws.ws_open and ws.is_identified():
+                return  # another caller already reconnected
+            if failed_ws is not None:
+                try:
+                    await failed_ws.disconnect()
+                except Exception:
+                    pass
+
+            # On failure self._ws is closed or None, so the next request tries again.
+            last_error: Exception | None = None
+            for attempt in range(1, self._reconnect_attempts + 1):
+                if attempt > 1:
+                    await asyncio.sleep(min(5.0, float(attempt - 1)))
+                try:
+                    await self.connect()
+                    return
+                except Exception as e:
+                    last_error = e
+                    log.warning("OBS reconnect attempt %s/%s failed: %s", attempt, self._reconnect_attempts, e)
+            raise ObsError(f"Lost connection to OBS and could not reconnect: {last_error}")
+
+    async def _send(
+        self, op: Callable[[simpleobsws.WebSocketClient], Awaitable[_T]], *, retry: bool
+    ) -> _T:
+        """
+        Run `op` on the socket; if the connection dropped, reconnect (keeping caches —
+        scene item ids survive reconnects) and retry once. With `retry=False` (OBS may already
+        have run the request before the drop) it still reconnects, then raises ObsError.
+        """
+        ws = self._ws
+        if ws is None:
+            if not self._want_connected:
+                raise ObsError("OBS client not connected")
+            # A previous reconnect failed outright; try again for this request.
+        else:
+            try:
+                return await op(ws)
+            except Exception:
+                if ws.ws_open and ws.is_identified():
+                    raise
+                log.warning("OBS connection lost; reconnecting...")
+        await self._reconnect(ws)
+        if ws is not None and not retry:
+            raise ObsError("Lost connection to OBS mid-request; not resent (it may already have run)")
+        return await op(self._require_ws())
+
     async def _call(self, request_type: str, request_data: dict[str, Any] | None = None) -> dict[str, Any]:
-        ws = self._require_ws()
         req = simpleobsws.Request(request_type, requestData=request_data or {})
-        resp = await ws.call(req)
+        resp = await self._send(lambda ws: ws.call(req), retry=_replayable([req]))
         if not resp.ok():
-            msg = resp.requestStatus.comment or "Unknown OBS error"
-            raise ObsError(f"{request_type} failed: {msg}")
+            raise self._response_error(resp)
         return resp.responseData or {}
 
+    async def _call_void(self, request_type: str, request_data: dict[str, Any]) -> None:
+        """`_call` for requests whose response carries no data (the hot `Set*` requests)."""
+        await self._send_void(simpleobsws.Request(request_type, requestData=request_data))
+
+    async def _send_void(self, req: simpleobsws.Request) -> None:
+        resp = await self._send(lambda ws: ws.call(req), retry=_replayable([req]))
+        if not resp.ok():
+            raise self._response_error(resp)
+
+    async def _call_batch(
+        self,
+        requests: list[simpleobsws.Request],
+        *,
+        execution_type: simpleobsws.RequestBatchExecutionType = _SERIAL,
+        timeout: float = 15,
+    ) -> list[dict[str, Any]]:
+        """Send `requests` as one RequestBatch (op 8); raise ObsError if any of them failed."""
+        results = await self._send(
+            lambda ws: ws.call_batch(requests, timeout=timeout, halt_on_failure=True, execution_type=execution_type),
+            retry=_replayable(requests),
+        )
+        for resp in results:
+            if not resp.ok():
+                raise self._response_error(resp)
+        if len(results) != len(requests):
+            raise ObsError(f"Request batch returned {len(results)} of {len(requests)} results")
+        return [resp.responseData or {} for resp in results]
+
+    async def _call_batch_each(self, requests: list[simpleobsws.Request]) -> list[dict[str, Any] | ObsError]:
+        """
+        Send `requests` as one RequestBatch without halting on failure; return each request's
+        response data, or the ObsError it failed with.
+        """
+        results = await self._send(
+            lambda ws: ws.call_batch(requests, halt_on_failure=False, execution_type=_SERIAL),
+            retry=_replayable(requests),
+        )
+        out: list[dict[str, Any] | ObsError] = [
+            (resp.responseData or {}) if resp.ok() else self._response_error(resp) for resp in results
+        ]
+        out += [ObsError("Missing result in request batch")] * (len(requests) - len(out))
+        return out
+
+    @staticmethod
+    def _response_error(resp: simpleobsws.RequestResponse) -> ObsError:
+        msg = resp.requestStatus.comment or "Unknown OBS error"
+        return ObsError(f"{resp.requestType} failed: {msg}")
+
     async def get_scene_item_list(self, scene_name: str) -> list[dict[str, Any]]:
         data = await self._call("GetSceneItemList", {"sceneName": scene_name})
         return list(data.get("sceneItems") or [])
@@ -105,40 +274,162 @@ class ObsClient:
 
         For MVP we use CreateInput (kind=image_source) in the target scene.
         """
+        key = (scene_name, source_name)
+        cached_id = self._scene_item_ids.get(key)
+        if cached_id is not None:
+            try:
+                await self._update_image_item(scene_name, source_name, cached_id, file_path, enabled)
+                return SceneItemHandle(scene_name=scene_name, source_name=source_name, scene_item_id=cached_id)
+            except ObsError:
+                # Removed or recreated in OBS behind our back: rediscover below.
+                self.invalidate_source(source_name)
+
         # Fast-path: already in scene
         existing_id = await self.get_scene_item_id(scene_name, source_name)
         if existing_id is None:
             # CreateInput will create the input and add it to the scene.
-            data = await self._call(
-                "CreateInput",
-                {
-                    "sceneName": scene_name,
-                    "inputName": source_name,
-                    "inputKind": "image_source",
-                    "inputSettings": {"file": str(file_path)},
-                    "sceneItemEnabled": bool(enabled),
-                },
-            )
+            data = await self._call(*self._create_image_payload(scene_name, source_name, file_path, enabled))
             scene_item_id = int(data["sceneItemId"])
         else:
             scene_item_id = existing_id
-            # Ensure correct file is set
-            await self.set_image_file(source_name, file_path)
-            await self.set_scene_item_enabled(scene_name, scene_item_id, enabled)
+            await self._update_image_item(scene_name, source_name, scene_item_id, file_path, enabled)
 
+        self._scene_item_ids[key] = scene_item_id
         return SceneItemHandle(scene_name=scene_name, source_name=source_name, scene_item_id=scene_item_id)
 
-    async def set_image_file(self, source_name: str, file_path: Path) -> None:
-        await self._call(
-            "SetInputSettings",
-            {"inputName": source_name, "inputSettings": {"file": str(file_path)}, "overlay": True},
+    async def bulk_ensure_images(self, specs: list[ImageSourceSpec]) -> list[SceneItemHandle]:
+        """
+        `ensure_image_source_in_scene` for many sources at once (e.g. startup).
+
+        Each phase is a single RequestBatch covering every source that needs it: GetSceneItemId
+        for sources not cached yet, CreateInput for the ones missing from the scene, then
+        SetInputSettings + SetSceneItemEnabled for the ones that already existed. Sources whose
+        batched update fails are retried one by one through `ensure_image_source_in_scene`.
+        """
+        ids = [self._scene_item_ids.get((s.scene_name, s.source_name)) for s in specs]
+
+        unknown = [i for i, sid in enumerate(ids) if sid is None]
+        if unknown:
+            results = await self._call_batch_each(
+                [
+                    simpleobsws.Request(
+                        "GetSceneItemId",
+                        requestData={"sceneName": specs[i].scene_name, "sourceName": specs[i].source_name},
+                    )
+                    for i in unknown
+                ]
+            )
+            for i, res in zip(unknown, results):
+                if not isinstance(res, ObsError) and "sceneItemId" in res:
+                    ids[i] = int(res["sceneItemId"])
+
+        missing = [i for i, sid in enumerate(ids) if sid is None]
+        if missing:
+            results = await self._call_batch_each(
+                [
+                    self._as_request(
+                        self._create_image_payload(
+                            specs[i].scene_name, specs[i].source_name, specs[i].file_path, specs[i].enabled
+                        )
+                    )
+                    for i in missing
+                ]
+            )
+            for i, res in zip(missing, results):
+                if isinstance(res, ObsError):
+                    raise res
+                ids[i] = int(res["sceneItemId"])
+
+        created = set(missing)
+        existing = [i for i in range(len(specs)) if i not in created]
+        retry: set[int] = set()
+        if existing:
+            requests: list[simpleobsws.Request] = []
+            for i in existing:
+                spec = specs[i]
+                requests.append(self._as_request(self.image_file_payload(spec.source_name, spec.file_path)))
+                requests.append(self._enabled_request(spec.scene_name, ids[i], spec.enabled))
+            results = await self._call_batch_each(requests)
+            for n, i in enumerate(existing):
+                if isinstance(results[2 * n], ObsError) or isinstance(results[2 * n + 1], ObsError):
+                    retry.add(i)
+
+        handles: list[SceneItemHandle] = []
+        for i, spec in enumerate(specs):
+            if i in retry:
+                # Stale cached id or a source edited behind our back: take the slow path.
+                self.invalidate_source(spec.source_name)
+                handle = await self.ensure_image_source_in_scene(
+                    scene_name=spec.scene_name,
+                    source_name=spec.source_name,
+                    file_path=spec.file_path,
+                    enabled=spec.enabled,
+                )
+            else:
+                handle = SceneItemHandle(scene_name=spec.scene_name, source_name=spec.source_name, scene_item_id=ids[i])
+            self._scene_item_ids[(spec.scene_name, spec.source_name)] = handle.scene_item_id
+            handles.append(handle)
+        return handles
+
+    async def _update_image_item(
+        self, scene_name: str, source_name: str, scene_item_id: int, file_path: Path, enabled: bool
+    ) -> None:
+        # Ensure correct file + visibility (independent requests, so send both at once).
+        await asyncio.gather(
+            self.set_image_file(source_name, file_path),
+            self.set_scene_item_enabled(scene_name, scene_item_id, enabled),
         )
 
+    @staticmethod
+    def image_file_payload(source_name: str, file_path: Path) -> tuple[str, dict[str, Any]]:
+        return "SetInputSettings", {"inputName": source_name, "inputSettings": {"file": str(file_path)}, "overlay": True}
+
+    @staticmethod
+    def _create_image_payload(
+        scene_name: str, source_name: str, file_path: Path, enabled: bool
+    ) -> tuple[str, dict[str, Any]]:
+        _, settings = ObsClient.image_file_payload(source_name, file_path)
+        return "CreateInput", {
+            "sceneName": scene_name,
+            "inputName": source_name,
+            "inputKind": "image_source",
+            "inputSettings": settings["inputSettings"],
+            "sceneItemEnabled": bool(enabled),
+        }
+
+    @staticmethod
+    def enabled_payload(scene_name: str, scene_item_id: int, enabled: bool) -> tuple[str, dict[str, Any]]:
+        return "SetSceneItemEnabled", {"sceneName": scene_name, "sceneItemId": scene_item_id, "sceneItemEnabled": enabled}
+
+    @staticmethod
+    def _as_request(payload: tuple[str, dict[str, Any]]) -> simpleobsws.Request:
+        request_type, data = payload
+        return simpleobsws.Request(request_type, requestData=data)
+
+    async def set_image_file(self, source_name: str, file_path: Path) -> None:
+        await self._call_void(*self.image_file_payload(source_name, file_path))
+
     async def set_scene_item_enabled(self, scene_name: str, scene_item_id: int, enabled: bool) -> None:
-        await self._call(
-            "SetSceneItemEnabled",
-            {"sceneName": scene_name, "sceneItemId": int(scene_item_id), "sceneItemEnabled": bool(enabled)},
-        )
+        await self._call_void(*self.enabled_payload(scene_name, scene_item_id, enabled))
+
+    async def request_batch(self, reqs: list[tuple[str, dict[str, Any]]]) -> list[dict[str, Any]]:
+        """
+        Send `(request_type, request_data)` pairs as one RequestBatch (in order, not halting on
+        failure). Requests that failed, or all of them if the batch itself was rejected, are retried
+        one by one; raises ObsError if a retry fails too.
+        """
+        if len(reqs) == 1:
+            return [await self._call(*reqs[0])]
+        results: list[dict[str, Any] | ObsError]
+        try:
+            results = await self._call_batch_each([self._as_request(r) for r in reqs])
+        except Exception as e:
+            log.debug("Request batch rejected, sending %s requests individually: %s", len(reqs), e)
+            results = [ObsError("batch rejected")] * len(reqs)
+        return [
+            await self._call(request_type, data) if isinstance(res, ObsError) else res
+            for (request_type, data), res in zip(reqs, results)
+        ]
 
     async def set_scene_item_transform(
         self,
@@ -150,34 +441,39 @@ class ObsClient:
         scale_x: float = 1.0,
         scale_y: float = 1.0,
     ) -> None:
-        await self._call(
+        await self._call_void(
             "SetSceneItemTransform",
             {
                 "sceneName": scene_name,
-                "sceneItemId": int(scene_item_id),
+                "sceneItemId": scene_item_id,
                 "sceneItemTransform": {
-                    "positionX": float(x),
-                    "positionY": float(y),
-                    "scaleX": float(scale_x),
-                    "scaleY": float(scale_y),
+                    "positionX": x,
+                    "positionY": y,
+                    "scaleX": scale_x,
+                    "scaleY": scale_y,
                 },
             },
         )
 
     async def set_scene_item_index(self, scene_name: str, scene_item_id: int, scene_item_index: int) -> None:
-        await self._call(
+        await self._call_void(
             "SetSceneItemIndex",
-            {"sceneName": scene_name, "sceneItemId": int(scene_item_id), "sceneItemIndex": int(scene_item_index)},
+            {"sceneName": scene_name, "sceneItemId": scene_item_id, "sceneItemIndex": scene_item_index},
         )
 
-    async def _get_opacity_filter_spec(self, source_name: str) -> OpacityFilterSpec:
-        cached = self._opacity_filter_cache.get(source_name)
+    async def _get_opacity_filter_spec(self) -> OpacityFilterSpec:
+        cached = self._spec_by_kind.get(_OPACITY_FILTER_KIND)
         if cached:
             return cached
+        async with self._spec_lock:  # concurrent first callers share one lookup
+            cached = self._spec_by_kind.get(_OPACITY_FILTER_KIND)
+            if cached:
+                return cached
+            spec = await self._fetch_opacity_filter_spec(_OPACITY_FILTER_KIND)
+            self._spec_by_kind[_OPACITY_FILTER_KIND] = spec
+            return spec
 
-        # We use Color Correction filter ("color_filter") because it exposes an opacity control.
-        filter_kind = "color_filter"
-        filter_name = "PNGTuberBotOpacity"
+    async def _fetch_opacity_filter_spec(self, filter_kind: str) -> OpacityFilterSpec:
 
         # Best-effort: detect the opacity key + scale from default settings.
         opacity_key = "opacity"
@@ -206,28 +502,40 @@ class ObsClient:
             # If OBS doesn't support the request (older versions), we fall back to defaults.
             pass
 
-        spec = OpacityFilterSpec(
-            filter_name=filter_name,
+        return OpacityFilterSpec(
+            filter_name=_OPACITY_FILTER_NAME,
             filter_kind=filter_kind,
             opacity_key=opacity_key,
             max_opacity=max_opacity,
         )
-        self._opacity_filter_cache[source_name] = spec
-        return spec
 
-    async def ensure_opacity_filter(self, source_name: str) -> OpacityFilterSpec:
-        spec = await self._get_opacity_filter_spec(source_name)
+    async def _get_source_filters(self, source_name: str) -> list[Any]:
         try:
             data = await self._call("GetSourceFilterList", {"sourceName": source_name})
-            filters = data.get("filters") or []
-            if isinstance(filters, list) and any(isinstance(f, dict) and f.get("filterName") == spec.filter_name for f in filters):
-                return spec
         except ObsError:
-            # Fall through: try to create.
-            pass
+            return []
+        filters = data.get("filters") or []
+        return filters if isinstance(filters, list) else []
 
-        # Create filter with full opacity by default.
-        await self._call(
+    async def ensure_opacity_filter(self, source_name: str) -> OpacityFilterSpec:
+        cached = self._spec_by_kind.get(_OPACITY_FILTER_KIND)
+        if cached and (source_name, cached.filter_name) in self._filter_present:
+            return cached
+
+        # Independent lookups: resolve the spec and list existing filters concurrently.
+        spec, filters = await asyncio.gather(
+            self._get_opacity_filter_spec(),
+            self._get_source_filters(source_name),
+        )
+        # Remember every filter the listing reported, not just ours.
+        names = {f.get("filterName") for f in filters if isinstance(f, dict)}
+        self._filter_present.update((source_name, name) for name in names if isinstance(name, str))
+        if spec.filter_name in names:
+            return spec
+        # Not found (or listing failed): try to create.
+
+        # Create filter with full opacity by default (only marked present once OBS accepted it).
+        await self._call_void(
             "CreateSourceFilter",
             {
                 "sourceName": source_name,
@@ -236,16 +544,152 @@ class ObsClient:
                 "filterSettings": {spec.opacity_key: spec.max_opacity},
             },
         )
+        self._filter_present.add((source_name, spec.filter_name))
         return spec
 
-    async def set_opacity(self, source_name: str, opacity_0_to_1: float) -> None:
-        spec = await self.ensure_opacity_filter(source_name)
-        opacity = max(0.0, min(1.0, float(opacity_0_to_1))) * spec.max_opacity
-        await self._call(
+    async def warm_up_scene_items(self, handles: list[SceneItemHandle]) -> None:
+        """
+        Have OBS render every (hidden) item once, at opacity 0, so the first real show doesn't wait
+        on texture upload. Each source gets the opacity filter first; sources whose filter can't be
+        created are skipped rather than flashed on screen. Items end up disabled at full opacity.
+        """
+        spec = await self._get_opacity_filter_spec()
+        missing = [h for h in handles if (h.source_name, spec.filter_name) not in self._filter_present]
+        if missing:
+            listings = await self._call_batch_each(
+                [simpleobsws.Request("GetSourceFilterList", requestData={"sourceName": h.source_name}) for h in missing]
+            )
+            to_create: list[SceneItemHandle] = []
+            for h, res in zip(missing, listings):
+                filters = [] if isinstance(res, ObsError) else res.get("filters") or []
+                names = {f.get("filterName") for f in filters if isinstance(f, dict)}
+                self._filter_present.update((h.source_name, name) for name in names if isinstance(name, str))
+                if spec.filter_name not in names:
+                    to_create.append(h)
+            if to_create:
+                created = await self._call_batch_each(
+                    [
+                        simpleobsws.Request(
+                            "CreateSourceFilter",
+                            requestData={
+                                "sourceName": h.source_name,
+                                "filterName": spec.filter_name,
+                                "filterKind": spec.filter_kind,
+                                "filterSettings": {spec.opacity_key: spec.max_opacity},
+                            },
+                        )
+                        for h in to_create
+                    ]
+                )
+                for h, res in zip(to_create, created):
+                    if not isinstance(res, ObsError):
+                        self._filter_present.add((h.source_name, spec.filter_name))
+        handles = [h for h in handles if (h.source_name, spec.filter_name) in self._filter_present]
+        if not handles:
+            return
+
+        # Serial and halting: no item is enabled unless its opacity 0 was applied first. The Sleep
+        # spans a couple of frames so the render thread actually draws the enabled items.
+        requests = [self._scaled_opacity_request(h.source_name, spec, 0.0) for h in handles]
+        requests += [self._enabled_request(h.scene_name, h.scene_item_id, True) for h in handles]
+        requests.append(simpleobsws.Request("Sleep", requestData={"sleepMillis": 50}))
+        cleanup = [self._enabled_request(h.scene_name, h.scene_item_id, False) for h in handles]
+        cleanup += [self._scaled_opacity_request(h.source_name, spec, spec.max_opacity) for h in handles]
+        try:
+            await self._call_batch(requests + cleanup)
+        except ObsError:
+            # Stopped part-way: hide everything and restore opacity, whatever did or didn't run.
+            await self._call_batch_each(cleanup)
+            raise
+
+    @staticmethod
+    def _opacity_request(source_name: str, spec: OpacityFilterSpec, opacity_0_to_1: float) -> simpleobsws.Request:
+        v = opacity_0_to_1
+        if not 0.0 <= v <= 1.0:  # common case is in range: one chained compare, no builtin calls
+            v = 0.0 if v < 0.0 else 1.0
+        return ObsClient._scaled_opacity_request(source_name, spec, v * spec.max_opacity)
+
+    @staticmethod
+    def _scaled_opacity_request(source_name: str, spec: OpacityFilterSpec, opacity: float) -> simpleobsws.Request:
+        # `opacity` is already in the filter's own range (0..spec.max_opacity); no clamping here.
+        return simpleobsws.Request(
             "SetSourceFilterSettings",
-            {"sourceName": source_name, "filterName": spec.filter_name, "filterSettings": {spec.opacity_key: opacity}},
+            requestData={
+                "sourceName": source_name,
+                "filterName": spec.filter_name,
+                "filterSettings": {spec.opacity_key: opacity},
+            },
         )
 
+    @staticmethod
+    def _enabled_request(scene_name: str, scene_item_id: int, enabled: bool) -> simpleobsws.Request:
+        return ObsClient._as_request(ObsClient.enabled_payload(scene_name, scene_item_id, enabled))
+
+    async def set_opacity(self, source_name: str, opacity_0_to_1: float) -> None:
+        spec = await self.ensure_opacity_filter(source_name)
+        try:
+            await self._queue_opacity(self._opacity_request(source_name, spec, opacity_0_to_1))
+        except ObsError:
+            # The filter may have been removed in OBS; re-check it next time.
+            self._filter_present.discard((source_name, spec.filter_name))
+            raise
+
+    async def _set_opacity_raw(self, source_name: str, spec: OpacityFilterSpec, opacity: float) -> None:
+        """set_opacity() for internal callers holding the spec and an already-scaled, in-range value."""
+        await self._queue_opacity(self._scaled_opacity_request(source_name, spec, opacity))
+
+    async def _queue_opacity(self, req: simpleobsws.Request) -> None:
+        fut: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._pending_opacity.append((req, fut))
+        if self._opacity_flush_task is None:
+            self._opacity_flush_task = asyncio.create_task(self._flush_opacity(), name="pngtuberbot:obs_opacity_flush")
+        await fut
+
+    async def _flush_opacity(self) -> None:
+        try:
+            # Yield once so concurrent callers (e.g. several fades) land in the same batch.
+            await asyncio.sleep(0)
+            while self._pending_opacity:
+                batch = self._pending_opacity[:_MAX_OPACITY_BATCH]
+                del self._pending_opacity[:_MAX_OPACITY_BATCH]
+                await self._send_opacity_batch(batch)
+        finally:
+            # A reconnect may already have started a newer flush task; leave that one alone.
+            if self._opacity_flush_task is asyncio.current_task():
+                self._opacity_flush_task = None
+
+    @staticmethod
+    def _fail_opacity(batch: list[tuple[simpleobsws.Request, asyncio.Future[None]]], err: Exception) -> None:
+        for _, fut in batch:
+            if not fut.done():
+                fut.set_exception(err)
+
+    async def _send_opacity_batch(self, batch: list[tuple[simpleobsws.Request, asyncio.Future[None]]]) -> None:
+        errors: list[Exception | None]
+        try:
+            if len(batch) == 1:
+                req = batch[0][0]
+                await self._send_void(req)
+                errors = [None]
+            else:
+                results = await self._call_batch_each([req for req, _ in batch])
+                errors = [res if isinstance(res, ObsError) else None for res in results]
+        except asyncio.CancelledError:
+            # Cancelled mid-send (disconnect): this batch is no longer in _pending_opacity, so
+            # fail its waiters here or they would hang forever.
+            self._fail_opacity(batch, ObsError("OBS client disconnected"))
+            raise
+        except Exception as e:
+            errors = [e] * len(batch)
+
+        for (_, fut), err in zip(batch, errors):
+            if fut.done():
+                continue
+            if err is None:
+                fut.set_result(None)
+            else:
+                fut.set_exception(err)
+
     async def fade_scene_item(
         self,
         *,
@@ -262,23 +706,88 @@ class ObsClient:
         If anything fails, caller should fall back to instant toggle.
         """
         duration_s = max(0.0, float(duration_s))
-        if duration_s == 0:
+        if duration_s * fps < 1.0:
+            # Shorter than one frame: nobody would see the fade, so hard-toggle without touching the filter.
             await self.set_scene_item_enabled(scene_name, scene_item_id, show)
             return
 
         steps = max(1, int(duration_s * fps))
         delay = duration_s / steps
 
+        spec = await self.ensure_opacity_filter(source_name)
+        # Every frame's opacity, already scaled to the filter's range, computed once up front.
+        scale = spec.max_opacity / steps
+        levels = range(1, steps + 1) if show else range(steps - 1, -1, -1)
+        values = tuple(i * scale for i in levels)
+
+        # Preferred: ship every frame in one RequestBatch and let OBS pace it with Sleep requests,
+        # instead of paying a client<->OBS round-trip per frame.
+        try:
+            await self._fade_batched(
+                scene_name=scene_name,
+                scene_item_id=scene_item_id,
+                source_name=source_name,
+                show=show,
+                spec=spec,
+                values=values,
+                delay=delay,
+            )
+            return
+        except ObsError as e:
+            log.debug("Batched fade failed for %s, falling back to per-frame requests: %s", source_name, e)
+            self.invalidate_source(source_name)
+            spec = await self.ensure_opacity_filter(source_name)
+
         if show:
-            await self.set_opacity(source_name, 0.0)
-            await self.set_scene_item_enabled(scene_name, scene_item_id, True)
-            for i in range(1, steps + 1):
-                await self.set_opacity(source_name, i / steps)
-                await asyncio.sleep(delay)
-        else:
-            for i in range(steps - 1, -1, -1):
-                await self.set_opacity(source_name, i / steps)
-                await asyncio.sleep(delay)
-            await self.set_scene_item_enabled(scene_name, scene_item_id, False)
+            # Opacity must be 0 before the item becomes visible; a serial batch keeps that order
+            # without a second round-trip.
+            await self._call_batch(
+                [
+                    self._scaled_opacity_request(source_name, spec, 0.0),
+                    self._enabled_request(scene_name, scene_item_id, True),
+                ]
+            )
 
+        # Frames are scheduled against a fixed baseline and sent without waiting for the previous
+        # reply, so request latency overlaps the frame interval instead of stretching the fade.
+        loop = asyncio.get_running_loop()
+        t0 = loop.time()
+        sends: list[asyncio.Task[None]] = []
+        try:
+            for i, value in enumerate(values):
+                await _sleep_until(loop, t0 + i * delay)
+                # Queued, so frames of fades running side by side share one RequestBatch per tick.
+                sends.append(asyncio.create_task(self._set_opacity_raw(source_name, spec, value)))
+            await _sleep_until(loop, t0 + len(values) * delay)
+            if not show:
+                # Disable on the next frame tick alongside outstanding replies, not one RTT after them.
+                sends.append(asyncio.create_task(self.set_scene_item_enabled(scene_name, scene_item_id, False)))
+            await asyncio.gather(*sends)
+        finally:
+            for task in sends:
+                task.cancel()
+
+    async def _fade_batched(
+        self,
+        *,
+        scene_name: str,
+        scene_item_id: int,
+        source_name: str,
+        show: bool,
+        spec: OpacityFilterSpec,
+        values: tuple[float, ...],
+        delay: float,
+    ) -> None:
+        sleep = simpleobsws.Request("Sleep", requestData={"sleepMillis": max(0, round(delay * 1000))})
 
+        requests: list[simpleobsws.Request] = []
+        if show:
+            requests.append(self._scaled_opacity_request(source_name, spec, 0.0))
+            requests.append(self._enabled_request(scene_name, scene_item_id, True))
+        for value in values:
+            requests.append(self._scaled_opacity_request(source_name, spec, value))
+            requests.append(sleep)
+        if not show:
+            requests.append(self._enabled_request(scene_name, scene_item_id, False))
+
+        await self._call_batch(requests, timeout=len(values) * delay + 15)
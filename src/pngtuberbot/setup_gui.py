@@ -1,18 +1,21 @@
 from __future__ import annotations
 
 import asyncio
+import concurrent.futures
+import io
+import socket
 import threading
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+from functools import lru_cache
 from pathlib import Path
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 from typing import Any
-import sys
 
-import yaml
-from PIL import Image, ImageDraw
+from pngtuberbot.config import default_config_path
 
-from pngtuberbot.obs_client import ObsClient
+# PIL, yaml and the OBS client (simpleobsws/websockets) are imported where they are used, so the
+# window comes up without paying for them.
 
 
 @dataclass
@@ -27,34 +30,103 @@ class UserRowVars:
     custom_deaf_icon: tk.StringVar
 
 
+_ICON_POSITIONS: tuple[str, ...] = ("top-right", "top-left", "bottom-right", "bottom-left")
+# Participant form rows: (label, UserRowVars field, width, entry sticky, has Browse button).
+_ROW_LAYOUT: tuple[tuple[str, str, int, str, bool], ...] = (
+    ("Name", "name", 30, "we", False),
+    ("Discord User ID", "discord_id", 30, "we", False),
+    ("Idle GIF", "idle_animation", 50, "we", True),
+    ("Talking GIF", "talking_animation", 50, "we", True),
+    ("Position slot (1-6 or blank=auto)", "position_slot", 10, "w", False),
+    ("Icon position", "icon_position", 15, "w", False),
+    ("Custom mute icon (optional)", "custom_mute_icon", 50, "we", True),
+    ("Custom deaf icon (optional)", "custom_deaf_icon", 50, "we", True),
+)
+
+_USER_ROW_FIELDS: tuple[str, ...] = tuple(f.name for f in fields(UserRowVars))
+# SetupApp StringVar attributes that end up in config.yaml.
+_TOP_LEVEL_FIELDS: tuple[str, ...] = (
+    "discord_token",
+    "guild_id",
+    "voice_channel_id",
+    "obs_host",
+    "obs_password",
+    "obs_scene",
+    "icon_mute_default",
+    "icon_deaf_default",
+)
+# Typed (IntVar/DoubleVar) SetupApp fields -> error shown when Tk can't parse what was typed.
+_NUMERIC_FIELDS: dict[str, str] = {
+    "obs_port": "OBS port must be an integer.",
+    "icon_size": "Icon size must be an integer.",
+    "animation_duration": "Fade duration must be a number.",
+    "talking_threshold": "Talking threshold must be a number.",
+    "talking_hangover_ms": "Talking hangover must be an integer.",
+}
+
+
 def _is_snowflake(s: str) -> bool:
-    s = (s or "").strip()
-    return s.isdigit() and 17 <= len(s) <= 20
+    s = s.strip() if s else ""
+    # Length first (cheap, rejects most bad input); then ASCII-only digits, as config.py expects.
+    return 17 <= len(s) <= 20 and s.isascii() and s.isdecimal()
+
+
+@lru_cache(maxsize=None)
+def _yaml() -> tuple[Any, type, type]:
+    """(yaml module, safe loader, safe dumper) — libyaml-backed when PyYAML was built with it."""
+    import yaml
+
+    return (
+        yaml,
+        getattr(yaml, "CSafeLoader", yaml.SafeLoader),
+        getattr(yaml, "CSafeDumper", yaml.SafeDumper),
+    )
 
 
 def _read_yaml_lenient(path: Path) -> dict[str, Any]:
     if not path.exists():
         return {}
     try:
-        raw = yaml.safe_load(path.read_text(encoding="utf-8"))
+        yaml, loader, _ = _yaml()
+        # Hand libyaml the bytes; it detects the encoding/BOM itself, no str decode+copy here.
+        with path.open("rb") as f:
+            raw = yaml.load(f, Loader=loader)
         return raw if isinstance(raw, dict) else {}
     except Exception:
         return {}
 
 
+# Encoded default icons by (size, label); they only depend on those two, so draw each once.
+_DEFAULT_ICON_CACHE: dict[tuple[int, str], bytes] = {}
+
+
 def _ensure_default_icons(base_dir: Path, mute_path: Path, deaf_path: Path, size: int) -> None:
+    if mute_path.exists() and deaf_path.exists():
+        return
     (base_dir / "assets" / "icons").mkdir(parents=True, exist_ok=True)
+    from PIL import Image, ImageDraw
+
+    base: Image.Image | None = None
 
     def make_icon(path: Path, label: str) -> None:
+        nonlocal base
         if path.exists():
             return
-        img = Image.new("RGBA", (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-        # Red circle + slash + label
-        draw.ellipse((2, 2, size - 2, size - 2), outline=(220, 40, 40, 255), width=4)
-        draw.line((8, size - 8, size - 8, 8), fill=(220, 40, 40, 255), width=5)
-        draw.text((size // 2 - 6, size // 2 - 7), label, fill=(220, 40, 40, 255))
-        img.save(path)
+        key = (size, label)
+        data = _DEFAULT_ICON_CACHE.get(key)
+        if data is None:
+            if base is None:
+                # Red circle + slash, shared by both icons; only the label differs.
+                base = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+                draw = ImageDraw.Draw(base)
+                draw.ellipse((2, 2, size - 2, size - 2), outline=(220, 40, 40, 255), width=4)
+                draw.line((8, size - 8, size - 8, 8), fill=(220, 40, 40, 255), width=5)
+            img = base.copy()
+            ImageDraw.Draw(img).text((size // 2 - 6, size // 2 - 7), label, fill=(220, 40, 40, 255))
+            buf = io.BytesIO()
+            img.save(buf, "PNG")
+            data = _DEFAULT_ICON_CACHE[key] = buf.getvalue()
+        path.write_bytes(data)
 
     make_icon(mute_path, "M")
     make_icon(deaf_path, "D")
@@ -74,20 +146,29 @@ class SetupApp(tk.Tk):
         self.voice_channel_id = tk.StringVar()
 
         self.obs_host = tk.StringVar(value="localhost")
-        self.obs_port = tk.StringVar(value="4455")
+        self.obs_port = tk.IntVar(value=4455)
         self.obs_password = tk.StringVar()
         self.obs_scene = tk.StringVar(value="Gaming")
 
         self.icon_mute_default = tk.StringVar(value="assets/icons/default_mute.png")
         self.icon_deaf_default = tk.StringVar(value="assets/icons/default_deaf.png")
-        self.icon_size = tk.StringVar(value="64")
+        self.icon_size = tk.IntVar(value=64)
 
-        self.animation_duration = tk.StringVar(value="0.5")
-        self.talking_threshold = tk.StringVar(value="0.02")
-        self.talking_hangover_ms = tk.StringVar(value="300")
+        self.animation_duration = tk.DoubleVar(value=0.5)
+        self.talking_threshold = tk.DoubleVar(value=0.02)
+        self.talking_hangover_ms = tk.IntVar(value=300)
         self.talking_while_muted = tk.BooleanVar(value=False)
 
         self.user_rows: list[UserRowVars] = []
+        self.user_frames: list[ttk.Labelframe] = []  # parallel to user_rows
+        # Last config read from / written to disk (used to carry the layout block across saves).
+        self._loaded_raw: dict[str, Any] = {}
+        # Background event loop for OBS tests, started on first use and reused across clicks.
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # One file dialog per filetypes filter, reused across Browse clicks.
+        self._file_dialogs: dict[tuple[tuple[str, str], ...], filedialog.Open] = {}
+
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
 
         self._build_ui()
         self._load_into_form()
@@ -125,7 +206,7 @@ class SetupApp(tk.Tk):
         ttk.Entry(conn, textvariable=self.obs_host, width=30).grid(row=4, column=1, sticky="w", padx=8)
 
         ttk.Label(conn, text="OBS Port").grid(row=5, column=0, sticky="w", pady=(8, 0))
-        ttk.Entry(conn, textvariable=self.obs_port, width=10).grid(row=5, column=1, sticky="w", padx=8, pady=(8, 0))
+        ttk.Spinbox(conn, textvariable=self.obs_port, from_=1, to=65535, width=10).grid(row=5, column=1, sticky="w", padx=8, pady=(8, 0))
 
         ttk.Label(conn, text="OBS Password").grid(row=6, column=0, sticky="w", pady=(8, 0))
         ttk.Entry(conn, textvariable=self.obs_password, show="*", width=30).grid(row=6, column=1, sticky="w", padx=8, pady=(8, 0))
@@ -141,6 +222,7 @@ class SetupApp(tk.Tk):
 
         ttk.Button(users_toolbar, text="Add Person", command=self._add_user_row).pack(side=tk.LEFT)
         ttk.Button(users_toolbar, text="Save Config", command=self._save_config).pack(side=tk.LEFT, padx=8)
+        ttk.Button(users_toolbar, text="Check OBS Port", command=self._check_obs_port).pack(side=tk.LEFT, padx=8)
         ttk.Button(users_toolbar, text="Test OBS Connection", command=self._test_obs).pack(side=tk.LEFT, padx=8)
 
         self.users_canvas = tk.Canvas(users, highlightthickness=0)
@@ -151,8 +233,9 @@ class SetupApp(tk.Tk):
         self.users_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
         self.users_inner = ttk.Frame(self.users_canvas, padding=(0, 12))
-        self.users_canvas.create_window((0, 0), window=self.users_inner, anchor="nw")
-        self.users_inner.bind("<Configure>", lambda e: self.users_canvas.configure(scrollregion=self.users_canvas.bbox("all")))
+        self._users_window = self.users_canvas.create_window((0, 0), window=self.users_inner, anchor="nw")
+        self._scroll_after: str | None = None
+        self.users_inner.bind("<Configure>", self._schedule_users_scrollregion)
 
         # Advanced
         row = 0
@@ -167,22 +250,22 @@ class SetupApp(tk.Tk):
         row += 1
 
         ttk.Label(adv, text="Icon size (px)").grid(row=row, column=0, sticky="w", pady=(8, 0))
-        ttk.Entry(adv, textvariable=self.icon_size, width=10).grid(row=row, column=1, sticky="w", padx=8, pady=(8, 0))
+        ttk.Spinbox(adv, textvariable=self.icon_size, from_=8, to=512, increment=8, width=10).grid(row=row, column=1, sticky="w", padx=8, pady=(8, 0))
         row += 1
 
         ttk.Separator(adv).grid(row=row, column=0, columnspan=3, sticky="we", pady=12)
         row += 1
 
         ttk.Label(adv, text="Fade duration (s)").grid(row=row, column=0, sticky="w")
-        ttk.Entry(adv, textvariable=self.animation_duration, width=10).grid(row=row, column=1, sticky="w", padx=8)
+        ttk.Spinbox(adv, textvariable=self.animation_duration, from_=0.1, to=10.0, increment=0.1, width=10).grid(row=row, column=1, sticky="w", padx=8)
         row += 1
 
         ttk.Label(adv, text="Talking threshold (RMS)").grid(row=row, column=0, sticky="w", pady=(8, 0))
-        ttk.Entry(adv, textvariable=self.talking_threshold, width=10).grid(row=row, column=1, sticky="w", padx=8, pady=(8, 0))
+        ttk.Spinbox(adv, textvariable=self.talking_threshold, from_=0.005, to=1.0, increment=0.005, width=10).grid(row=row, column=1, sticky="w", padx=8, pady=(8, 0))
         row += 1
 
         ttk.Label(adv, text="Talking hangover (ms)").grid(row=row, column=0, sticky="w", pady=(8, 0))
-        ttk.Entry(adv, textvariable=self.talking_hangover_ms, width=10).grid(row=row, column=1, sticky="w", padx=8, pady=(8, 0))
+        ttk.Spinbox(adv, textvariable=self.talking_hangover_ms, from_=0, to=5000, increment=50, width=10).grid(row=row, column=1, sticky="w", padx=8, pady=(8, 0))
         row += 1
 
         ttk.Checkbutton(adv, text="Allow talking animation while muted", variable=self.talking_while_muted).grid(
@@ -192,8 +275,22 @@ class SetupApp(tk.Tk):
 
         adv.columnconfigure(1, weight=1)
 
+    def _schedule_users_scrollregion(self, _event: tk.Event | None = None) -> None:
+        # Coalesce bursts of <Configure> (rows added, window resized) into one bbox() when idle.
+        if self._scroll_after is not None:
+            self.after_cancel(self._scroll_after)
+        self._scroll_after = self.after_idle(self._update_users_scrollregion)
+
+    def _update_users_scrollregion(self) -> None:
+        self._scroll_after = None
+        self.users_canvas.configure(scrollregion=self.users_canvas.bbox("all"))
+
     def _browse_to(self, var: tk.StringVar, *, filetypes: list[tuple[str, str]] | None = None) -> None:
-        path = filedialog.askopenfilename(filetypes=filetypes or [("All files", "*.*")])
+        key = tuple(filetypes or (("All files", "*.*"),))
+        dlg = self._file_dialogs.get(key)
+        if dlg is None:
+            dlg = self._file_dialogs[key] = filedialog.Open(self, filetypes=list(key))
+        path = dlg.show()
         if path:
             var.set(path)
 
@@ -216,48 +313,23 @@ class SetupApp(tk.Tk):
         frm = ttk.Labelframe(self.users_inner, text=f"Person {row + 1}", padding=10)
         frm.grid(row=row, column=0, sticky="we", pady=8)
         frm.columnconfigure(1, weight=1)
-
-        ttk.Label(frm, text="Name").grid(row=0, column=0, sticky="w")
-        ttk.Entry(frm, textvariable=vars_.name, width=30).grid(row=0, column=1, sticky="we", padx=8)
-
-        ttk.Label(frm, text="Discord User ID").grid(row=1, column=0, sticky="w", pady=(8, 0))
-        ttk.Entry(frm, textvariable=vars_.discord_id, width=30).grid(row=1, column=1, sticky="we", padx=8, pady=(8, 0))
-
-        ttk.Label(frm, text="Idle GIF").grid(row=2, column=0, sticky="w", pady=(8, 0))
-        ttk.Entry(frm, textvariable=vars_.idle_animation, width=50).grid(row=2, column=1, sticky="we", padx=8, pady=(8, 0))
-        ttk.Button(frm, text="Browse", command=lambda v=vars_.idle_animation: self._browse_to(v)).grid(
-            row=2, column=2, pady=(8, 0)
-        )
-
-        ttk.Label(frm, text="Talking GIF").grid(row=3, column=0, sticky="w", pady=(8, 0))
-        ttk.Entry(frm, textvariable=vars_.talking_animation, width=50).grid(row=3, column=1, sticky="we", padx=8, pady=(8, 0))
-        ttk.Button(frm, text="Browse", command=lambda v=vars_.talking_animation: self._browse_to(v)).grid(
-            row=3, column=2, pady=(8, 0)
-        )
-
-        ttk.Label(frm, text="Position slot (1-6 or blank=auto)").grid(row=4, column=0, sticky="w", pady=(8, 0))
-        ttk.Entry(frm, textvariable=vars_.position_slot, width=10).grid(row=4, column=1, sticky="w", padx=8, pady=(8, 0))
-
-        ttk.Label(frm, text="Icon position").grid(row=5, column=0, sticky="w", pady=(8, 0))
-        ttk.Combobox(
-            frm,
-            textvariable=vars_.icon_position,
-            values=["top-right", "top-left", "bottom-right", "bottom-left"],
-            width=15,
-            state="readonly",
-        ).grid(row=5, column=1, sticky="w", padx=8, pady=(8, 0))
-
-        ttk.Label(frm, text="Custom mute icon (optional)").grid(row=6, column=0, sticky="w", pady=(8, 0))
-        ttk.Entry(frm, textvariable=vars_.custom_mute_icon, width=50).grid(row=6, column=1, sticky="we", padx=8, pady=(8, 0))
-        ttk.Button(frm, text="Browse", command=lambda v=vars_.custom_mute_icon: self._browse_to(v)).grid(
-            row=6, column=2, pady=(8, 0)
-        )
-
-        ttk.Label(frm, text="Custom deaf icon (optional)").grid(row=7, column=0, sticky="w", pady=(8, 0))
-        ttk.Entry(frm, textvariable=vars_.custom_deaf_icon, width=50).grid(row=7, column=1, sticky="we", padx=8, pady=(8, 0))
-        ttk.Button(frm, text="Browse", command=lambda v=vars_.custom_deaf_icon: self._browse_to(v)).grid(
-            row=7, column=2, pady=(8, 0)
-        )
+        self.user_frames.append(frm)
+
+        for r, (label, attr, width, sticky, browse) in enumerate(_ROW_LAYOUT):
+            pady = (8, 0) if r else 0
+            var = getattr(vars_, attr)
+            ttk.Label(frm, text=label).grid(row=r, column=0, sticky="w", pady=pady)
+            if attr == "icon_position":
+                widget: ttk.Widget = ttk.Combobox(
+                    frm, textvariable=var, values=list(_ICON_POSITIONS), width=width, state="readonly"
+                )
+            else:
+                widget = ttk.Entry(frm, textvariable=var, width=width)
+            widget.grid(row=r, column=1, sticky=sticky, padx=8, pady=pady)
+            if browse:
+                ttk.Button(frm, text="Browse", command=lambda v=var: self._browse_to(v)).grid(
+                    row=r, column=2, pady=pady
+                )
 
         def remove_row() -> None:
             try:
@@ -265,21 +337,23 @@ class SetupApp(tk.Tk):
             except ValueError:
                 return
             self.user_rows.pop(idx)
+            self.user_frames.pop(idx)
             frm.destroy()
-            self._renumber_user_frames()
+            self._renumber_user_frames(idx)
 
         ttk.Button(frm, text="Remove", command=remove_row).grid(row=0, column=2, padx=(8, 0))
 
-    def _renumber_user_frames(self) -> None:
-        # Re-label frames after removals.
-        for i, child in enumerate(self.users_inner.winfo_children()):
-            if isinstance(child, ttk.Labelframe):
-                child.configure(text=f"Person {i + 1}")
+    def _renumber_user_frames(self, start: int = 0) -> None:
+        # Re-label (and re-grid, so later additions don't collide) frames after a removal at `start`.
+        for i in range(start, len(self.user_frames)):
+            self.user_frames[i].configure(text=f"Person {i + 1}")
+            self.user_frames[i].grid_configure(row=i)
 
     # ---------------- IO ----------------
 
     def _load_into_form(self) -> None:
         raw = _read_yaml_lenient(self.config_path)
+        self._loaded_raw = raw
 
         discord = raw.get("discord") if isinstance(raw.get("discord"), dict) else {}
         obs = raw.get("obs") if isinstance(raw.get("obs"), dict) else {}
@@ -291,80 +365,116 @@ class SetupApp(tk.Tk):
         self.voice_channel_id.set(str(discord.get("voice_channel_id", "")))
 
         self.obs_host.set(str(obs.get("websocket_host", self.obs_host.get())))
-        self.obs_port.set(str(obs.get("websocket_port", self.obs_port.get())))
+        self.obs_port.set(obs.get("websocket_port", self.obs_port.get()))
         self.obs_password.set(str(obs.get("websocket_password", self.obs_password.get() or "")))
         self.obs_scene.set(str(obs.get("scene_name", self.obs_scene.get())))
 
         self.icon_mute_default.set(str(icons.get("mute_default", self.icon_mute_default.get())))
         self.icon_deaf_default.set(str(icons.get("deaf_default", self.icon_deaf_default.get())))
-        self.icon_size.set(str(icons.get("size", self.icon_size.get())))
+        self.icon_size.set(icons.get("size", self.icon_size.get()))
 
-        self.animation_duration.set(str(advanced.get("animation_duration", self.animation_duration.get())))
-        self.talking_threshold.set(str(advanced.get("talking_threshold", self.talking_threshold.get())))
-        self.talking_hangover_ms.set(str(advanced.get("talking_hangover_ms", self.talking_hangover_ms.get())))
+        self.animation_duration.set(advanced.get("animation_duration", self.animation_duration.get()))
+        self.talking_threshold.set(advanced.get("talking_threshold", self.talking_threshold.get()))
+        self.talking_hangover_ms.set(advanced.get("talking_hangover_ms", self.talking_hangover_ms.get()))
         self.talking_while_muted.set(bool(advanced.get("talking_while_muted", False)))
 
         users = raw.get("users") if isinstance(raw.get("users"), list) else []
-        for u in users:
-            if isinstance(u, dict):
-                self._add_user_row(u)
-
-        if not self.user_rows:
-            self._add_user_row()
+        # Build all rows while the frame is unmapped and without the scrollregion hook, so Tk does
+        # one geometry pass + one bbox() instead of one per row.
+        self.users_inner.unbind("<Configure>")
+        self.users_canvas.itemconfigure(self._users_window, state="hidden")
+        try:
+            for u in users:
+                if isinstance(u, dict):
+                    self._add_user_row(u)
+
+            if not self.user_rows:
+                self._add_user_row()
+        finally:
+            self.users_canvas.itemconfigure(self._users_window, state="normal")
+            self.users_inner.update_idletasks()
+            self.users_inner.bind("<Configure>", self._schedule_users_scrollregion)
+            self._update_users_scrollregion()
+
+    def _validate_and_build(self) -> tuple[dict[str, Any] | None, list[str]]:
+        """Validate the form and build the config dict from one read of the form variables."""
+        top, rows = self._form_snapshot()
+        errs = self._validate_values(top, rows)
+        if errs:
+            return None, errs
+        return self._build_from_values(top, rows), []
 
-    def _validate(self) -> list[str]:
+    def _validate_values(self, top: dict[str, Any], rows: list[dict[str, str]]) -> list[str]:
         errs: list[str] = []
-        if not self.discord_token.get().strip():
+        if not top["discord_token"].strip():
             errs.append("Discord bot token is required.")
-        if not _is_snowflake(self.guild_id.get()):
+        if not _is_snowflake(top["guild_id"]):
             errs.append("Guild ID must be a Discord snowflake (17-20 digits).")
-        if not _is_snowflake(self.voice_channel_id.get()):
+        if not _is_snowflake(top["voice_channel_id"]):
             errs.append("Voice Channel ID must be a Discord snowflake (17-20 digits).")
 
-        try:
-            int(self.obs_port.get())
-        except Exception:
-            errs.append("OBS port must be an integer.")
-
-        if not self.obs_scene.get().strip():
+        if not top["obs_scene"].strip():
             errs.append("OBS scene name is required.")
 
+        errs.extend(msg for name, msg in _NUMERIC_FIELDS.items() if top[name] is None)
+        # Same ranges config.py enforces on load.
+        if top["animation_duration"] is not None and top["animation_duration"] <= 0:
+            errs.append("Fade duration must be > 0.")
+        if top["talking_threshold"] is not None and top["talking_threshold"] <= 0:
+            errs.append("Talking threshold must be > 0.")
+        if top["talking_hangover_ms"] is not None and top["talking_hangover_ms"] < 0:
+            errs.append("Talking hangover must be >= 0.")
+
         # Participants
-        if not self.user_rows:
+        if not rows:
             errs.append("At least one participant is required.")
-        for i, u in enumerate(self.user_rows):
+        for i, u in enumerate(rows):
             prefix = f"Person {i + 1}: "
-            if not u.name.get().strip():
+            if not u["name"].strip():
                 errs.append(prefix + "name is required.")
-            if not _is_snowflake(u.discord_id.get()):
+            if not _is_snowflake(u["discord_id"]):
                 errs.append(prefix + "Discord User ID must be 17-20 digits.")
-            if not u.idle_animation.get().strip():
+            if not u["idle_animation"].strip():
                 errs.append(prefix + "idle GIF path is required.")
-            if not u.talking_animation.get().strip():
+            if not u["talking_animation"].strip():
                 errs.append(prefix + "talking GIF path is required.")
 
         return errs
 
-    def _build_config_dict(self) -> dict[str, Any]:
+    def _form_snapshot(self) -> tuple[dict[str, Any], list[dict[str, str]]]:
+        """
+        Read every form variable once (each .get() is a Tcl round-trip). Numeric fields are
+        already parsed by Tk; ones holding text it can't parse come back as None.
+        """
+        top: dict[str, Any] = {name: getattr(self, name).get() for name in _TOP_LEVEL_FIELDS}
+        for name in _NUMERIC_FIELDS:
+            try:
+                top[name] = getattr(self, name).get()
+            except tk.TclError:
+                top[name] = None
+        rows = [{name: getattr(u, name).get() for name in _USER_ROW_FIELDS} for u in self.user_rows]
+        return top, rows
+
+    def _build_from_values(self, top: dict[str, Any], rows: list[dict[str, str]]) -> dict[str, Any]:
         users_out: list[dict[str, Any]] = []
-        for u in self.user_rows:
-            slot_s = u.position_slot.get().strip()
+        for u in rows:
+            slot_s = u["position_slot"].strip()
             slot = int(slot_s) if slot_s.isdigit() else None
             users_out.append(
                 {
-                    "discord_id": u.discord_id.get().strip(),
-                    "name": u.name.get().strip(),
-                    "idle_animation": u.idle_animation.get().strip(),
-                    "talking_animation": u.talking_animation.get().strip(),
+                    "discord_id": u["discord_id"].strip(),
+                    "name": u["name"].strip(),
+                    "idle_animation": u["idle_animation"].strip(),
+                    "talking_animation": u["talking_animation"].strip(),
                     "position_slot": slot,
-                    "icon_position": u.icon_position.get().strip() or "top-right",
-                    "custom_mute_icon": u.custom_mute_icon.get().strip() or None,
-                    "custom_deaf_icon": u.custom_deaf_icon.get().strip() or None,
+                    "icon_position": u["icon_position"].strip() or "top-right",
+                    "custom_mute_icon": u["custom_mute_icon"].strip() or None,
+                    "custom_deaf_icon": u["custom_deaf_icon"].strip() or None,
                 }
             )
 
         # Keep existing layout positions if present; otherwise default.
-        existing = _read_yaml_lenient(self.config_path)
+        existing = self._loaded_raw
         layout = existing.get("layout") if isinstance(existing.get("layout"), dict) else None
         if not layout:
             layout = {
@@ -381,92 +491,127 @@ class SetupApp(tk.Tk):
 
         return {
             "discord": {
-                "bot_token": self.discord_token.get().strip(),
-                "guild_id": int(self.guild_id.get().strip()),
-                "voice_channel_id": int(self.voice_channel_id.get().strip()),
+                "bot_token": top["discord_token"].strip(),
+                "guild_id": int(top["guild_id"].strip()),
+                "voice_channel_id": int(top["voice_channel_id"].strip()),
             },
             "obs": {
-                "websocket_host": self.obs_host.get().strip(),
-                "websocket_port": int(self.obs_port.get().strip()),
-                "websocket_password": self.obs_password.get(),
-                "scene_name": self.obs_scene.get().strip(),
+                "websocket_host": top["obs_host"].strip(),
+                "websocket_port": top["obs_port"],
+                "websocket_password": top["obs_password"],
+                "scene_name": top["obs_scene"].strip(),
             },
             "users": users_out,
             "layout": layout,
             "icons": {
-                "mute_default": self.icon_mute_default.get().strip(),
-                "deaf_default": self.icon_deaf_default.get().strip(),
-                "size": int(self.icon_size.get().strip() or "64"),
+                "mute_default": top["icon_mute_default"].strip(),
+                "deaf_default": top["icon_deaf_default"].strip(),
+                "size": top["icon_size"],
             },
             "advanced": {
-                "animation_duration": float(self.animation_duration.get().strip() or "0.5"),
+                "animation_duration": top["animation_duration"],
                 "reconnect_attempts": 3,
                 "log_level": "INFO",
-                "talking_threshold": float(self.talking_threshold.get().strip() or "0.02"),
-                "talking_hangover_ms": int(self.talking_hangover_ms.get().strip() or "300"),
+                "talking_threshold": top["talking_threshold"],
+                "talking_hangover_ms": top["talking_hangover_ms"],
                 "talking_while_muted": bool(self.talking_while_muted.get()),
             },
         }
 
     def _save_config(self) -> None:
-        errs = self._validate()
-        if errs:
+        cfg, errs = self._validate_and_build()
+        if cfg is None:
             messagebox.showerror("Fix config errors", "\n".join(errs))
             return
 
-        cfg = self._build_config_dict()
-
         # Ensure default icons exist (relative to base_dir).
         mute_p = Path(cfg["icons"]["mute_default"])
         deaf_p = Path(cfg["icons"]["deaf_default"])
+        # Plain joins: _ensure_default_icons only needs a usable path, not a canonical one.
         if not mute_p.is_absolute():
-            mute_p = (self.base_dir / mute_p).resolve()
+            mute_p = self.base_dir / mute_p
         if not deaf_p.is_absolute():
-            deaf_p = (self.base_dir / deaf_p).resolve()
+            deaf_p = self.base_dir / deaf_p
 
         _ensure_default_icons(self.base_dir, mute_p, deaf_p, int(cfg["icons"]["size"]))
 
-        self.config_path.write_text(yaml.safe_dump(cfg, sort_keys=False), encoding="utf-8")
+        yaml, _, dumper = _yaml()
+        self.config_path.write_text(yaml.dump(cfg, Dumper=dumper, sort_keys=False), encoding="utf-8")
+        self._loaded_raw = cfg
         messagebox.showinfo("Saved", f"Saved configuration to:\n{self.config_path}")
 
-    def _test_obs(self) -> None:
-        errs = []
+    def _obs_target(self) -> tuple[str, int] | None:
         try:
-            port = int(self.obs_port.get().strip())
-        except Exception:
-            port = 4455
-            errs.append("OBS port must be an integer.")
-        if errs:
-            messagebox.showerror("Fix config errors", "\n".join(errs))
+            port = self.obs_port.get()
+        except tk.TclError:
+            messagebox.showerror("Fix config errors", _NUMERIC_FIELDS["obs_port"])
+            return None
+        return self.obs_host.get().strip() or "localhost", port
+
+    def _check_obs_port(self) -> None:
+        """Quick reachability check: is anything accepting TCP on the OBS WebSocket port?"""
+        target = self._obs_target()
+        if target is None:
             return
+        host, port = target
 
-        host = self.obs_host.get().strip() or "localhost"
+        def worker() -> None:
+            try:
+                with socket.create_connection((host, port), timeout=2.0):
+                    pass
+                self.after(0, lambda: messagebox.showinfo("OBS reachable", f"{host}:{port} accepts connections."))
+            except OSError as e:
+                err = str(e)
+                self.after(0, lambda: messagebox.showerror("OBS not reachable", f"{host}:{port}: {err}"))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _test_obs(self) -> None:
+        """Full check: connect and authenticate to OBS WebSocket and ask for its version."""
+        target = self._obs_target()
+        if target is None:
+            return
+        host, port = target
         password = self.obs_password.get()
 
-        def worker() -> None:
-            async def _run() -> dict[str, Any]:
-                obs = ObsClient(host, port, password)
-                await obs.connect()
-                ver = await obs.get_version()
+        async def _run() -> dict[str, Any]:
+            from pngtuberbot.obs_client import ObsClient
+
+            obs = ObsClient(host, port, password)
+            await obs.connect()
+            try:
+                return await obs.get_version()
+            finally:
                 await obs.disconnect()
-                return ver
 
+        def done(fut: concurrent.futures.Future[dict[str, Any]]) -> None:
+            # Runs on the loop thread; hand the result back to Tk.
             try:
-                ver = asyncio.run(_run())
+                ver = fut.result()
                 msg = f"Connected to OBS.\nOBS: {ver.get('obsVersion', ver)}"
                 self.after(0, lambda: messagebox.showinfo("OBS OK", msg))
             except Exception as e:
-                self.after(0, lambda: messagebox.showerror("OBS connection failed", str(e)))
+                err = str(e)
+                self.after(0, lambda: messagebox.showerror("OBS connection failed", err))
 
-        threading.Thread(target=worker, daemon=True).start()
+        asyncio.run_coroutine_threadsafe(_run(), self._async_loop()).add_done_callback(done)
+
+    def _async_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="pngtuberbot-setup-loop", daemon=True).start()
+            self._loop = loop
+        return self._loop
+
+    def _on_close(self) -> None:
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+        self.destroy()
 
 
 def main() -> int:
-    if getattr(sys, "frozen", False):
-        cfg_path = Path(sys.executable).resolve().with_name("config.yaml")
-    else:
-        cfg_path = Path("config.yaml").resolve()
-    app = SetupApp(cfg_path)
+    app = SetupApp(default_config_path())
     app.mainloop()
     return 0
 
@@ -3,25 +3,45 @@ from __future__ import annotations
 import asyncio
 import logging
 from dataclasses import dataclass
-from typing import Any
-
-from PIL import Image
+from pathlib import Path
+from typing import Any, Awaitable
 
 from .config import AppConfig
 from .discord_bot import PNGTuberDiscordClient, VoiceMuteDeafState, VoicePresenceChange
-from .layout import assign_slots, compute_user_layout
-from .obs_client import ObsClient, ObsError, SceneItemHandle
+from .layout import image_size
+from .obs_client import ImageSourceSpec, ObsClient, ObsError, SceneItemHandle
 from .voice_activity import RmsAudioSink, RmsVoiceActivityDetector, join_voice_channel_for_listening
 
 
 log = logging.getLogger(__name__)
 
+# Speaking edges closer together than this are coalesced per user: the first is applied at once,
+# the last one seen inside the window is applied when it closes.
+_SPEAKING_DEBOUNCE_S = 0.1
+
+
+def _move_item(order: list[int], item_id: int, index: int) -> None:
+    """Mirror OBS SetSceneItemIndex on a local list of scene item ids (bottom to top)."""
+    if item_id in order:
+        order.remove(item_id)
+    order.insert(min(index, len(order)), item_id)
+
 
-@dataclass
+@dataclass(slots=True)
 class _UserRuntime:
     present: bool = False
     muted: bool = False
     deafened: bool = False
+    # Last values sent to OBS (None = unknown), so repeated events don't resend them.
+    talking_shown: bool | None = None
+    mute_shown: bool | None = None
+    deaf_shown: bool | None = None
+    # Speaking debounce: open window timer, last edge applied, latest edge seen inside the
+    # window, trailing apply task.
+    speaking_timer: asyncio.TimerHandle | None = None
+    speaking_applied: bool | None = None
+    speaking_pending: bool | None = None
+    speaking_task: asyncio.Task[None] | None = None
 
 
 class PNGTuberBotRuntime:
@@ -37,10 +57,15 @@ class PNGTuberBotRuntime:
         self.cfg = cfg
         self.scene_name = cfg.obs.scene_name
 
-        self.users_by_id = {u.discord_id: u for u in cfg.users}
-        self._user_state: dict[int, _UserRuntime] = {uid: _UserRuntime() for uid in self.users_by_id}
+        self._user_state: dict[int, _UserRuntime] = {uid: _UserRuntime() for uid in cfg.user_index}
+        self._tracked_ids: frozenset[int] = frozenset(cfg.user_index)
 
-        self.obs = ObsClient(cfg.obs.websocket_host, cfg.obs.websocket_port, cfg.obs.websocket_password)
+        self.obs = ObsClient(
+            cfg.obs.websocket_host,
+            cfg.obs.websocket_port,
+            cfg.obs.websocket_password,
+            reconnect_attempts=cfg.advanced.reconnect_attempts,
+        )
         self._scene_items: dict[int, dict[str, SceneItemHandle]] = {}
 
         self.discord: PNGTuberDiscordClient | None = None
@@ -50,6 +75,9 @@ class PNGTuberBotRuntime:
     def _avatar_source(self, user_id: int) -> str:
         return f"pngtuber_{user_id}"
 
+    def _talking_source(self, user_id: int) -> str:
+        return f"pngtuber_{user_id}_talking"
+
     def _mute_source(self, user_id: int) -> str:
         return f"pngtuber_{user_id}_mute"
 
@@ -64,106 +92,135 @@ class PNGTuberBotRuntime:
         except Exception:
             pass
 
-        # Create/resolve scene items for each user.
-        for uid, ucfg in self.users_by_id.items():
+        # Create/resolve scene items for every user in one go (a few RequestBatches in total).
+        # Idle and talking images are separate sources, so speaking only swaps which one is
+        # visible instead of making OBS reload the file.
+        specs: list[ImageSourceSpec] = []
+        icon_paths: dict[int, tuple[Path, Path]] = {}
+        for ucfg in self.cfg.users:
+            uid = ucfg.discord_id
             mute_icon = ucfg.custom_mute_icon or self.cfg.icons.mute_default
             deaf_icon = ucfg.custom_deaf_icon or self.cfg.icons.deaf_default
+            icon_paths[uid] = (mute_icon, deaf_icon)
+            # Same order as the final stack (bottom to top): freshly created items land on top of
+            # the scene in creation order, so the ordering pass below has nothing to move.
+            specs.append(ImageSourceSpec(self.scene_name, self._mute_source(uid), mute_icon, False))
+            specs.append(ImageSourceSpec(self.scene_name, self._deaf_source(uid), deaf_icon, False))
+            specs.append(ImageSourceSpec(self.scene_name, self._avatar_source(uid), ucfg.idle_animation, False))
+            specs.append(ImageSourceSpec(self.scene_name, self._talking_source(uid), ucfg.talking_animation, False))
+
+        handles_list = await self.obs.bulk_ensure_images(specs)
+        # Specs were built in cfg.users order, so each user's four handles sit at its user_index.
+        for uid, n in self.cfg.user_index.items():
+            mute, deaf, avatar, talking = handles_list[4 * n : 4 * n + 4]
+            self._scene_items[uid] = {"avatar": avatar, "talking": talking, "mute": mute, "deaf": deaf}
+            st = self._user_state[uid]
+            st.talking_shown = st.mute_shown = st.deaf_shown = False
+
+        # Best-effort: render every image once while invisible, so the first join/mute/talk
+        # doesn't wait on OBS uploading the texture.
+        try:
+            await self.obs.warm_up_scene_items(handles_list)
+        except Exception as e:
+            log.debug("Could not warm up OBS image sources: %s", e)
 
-            avatar = await self.obs.ensure_image_source_in_scene(
-                scene_name=self.scene_name,
-                source_name=self._avatar_source(uid),
-                file_path=ucfg.idle_animation,
-                enabled=False,
-            )
-            mute = await self.obs.ensure_image_source_in_scene(
-                scene_name=self.scene_name,
-                source_name=self._mute_source(uid),
-                file_path=mute_icon,
-                enabled=False,
-            )
-            deaf = await self.obs.ensure_image_source_in_scene(
-                scene_name=self.scene_name,
-                source_name=self._deaf_source(uid),
-                file_path=deaf_icon,
-                enabled=False,
-            )
-
-            self._scene_items[uid] = {"avatar": avatar, "mute": mute, "deaf": deaf}
-
-        # Apply layout transforms (simple 6-slot mode).
-        slot_map = assign_slots(list(self.cfg.users))
-
-        def _img_size(p) -> tuple[int, int]:
-            try:
-                with Image.open(p) as im:
-                    return int(im.size[0]), int(im.size[1])
-            except Exception:
-                return 0, 0
+        # Apply layout transforms (simple 6-slot mode; computed by load_config).
 
+        # Transforms are independent of each other: send them all at once.
+        transforms: list[Awaitable[None]] = []
+        transform_labels: list[tuple[int, str]] = []  # (discord_id, item key), parallel to transforms
         for user in self.cfg.users:
             uid = user.discord_id
             handles = self._scene_items.get(uid)
             if not handles:
                 continue
 
-            slot = slot_map[uid]
-            ul = compute_user_layout(user=user, slot=slot, layout=self.cfg.layout, icon_size=self.cfg.icons.size)
-
-            # Avatar: position only (scale left as-is).
-            await self.obs.set_scene_item_transform(
-                scene_name=self.scene_name,
-                scene_item_id=handles["avatar"].scene_item_id,
-                x=ul.avatar_x,
-                y=ul.avatar_y,
-                scale_x=1.0,
-                scale_y=1.0,
-            )
+            ul = self.cfg.layout_by_user[uid]
+
+            # Avatar (idle + talking): position only (scale left as-is).
+            for key in ("avatar", "talking"):
+                transforms.append(
+                    self.obs.set_scene_item_transform(
+                        scene_name=self.scene_name,
+                        scene_item_id=handles[key].scene_item_id,
+                        x=ul.avatar_x,
+                        y=ul.avatar_y,
+                        scale_x=1.0,
+                        scale_y=1.0,
+                    )
+                )
+                transform_labels.append((uid, key))
 
             # Icons: force configured pixel size via scale, then place.
-            mute_icon_path = user.custom_mute_icon or self.cfg.icons.mute_default
-            deaf_icon_path = user.custom_deaf_icon or self.cfg.icons.deaf_default
+            mute_icon_path, deaf_icon_path = icon_paths[uid]
 
-            mw, mh = _img_size(mute_icon_path)
-            dw, dh = _img_size(deaf_icon_path)
+            mw, mh = image_size(mute_icon_path)
+            dw, dh = image_size(deaf_icon_path)
             mute_sx = (self.cfg.icons.size / mw) if mw else 1.0
             mute_sy = (self.cfg.icons.size / mh) if mh else 1.0
             deaf_sx = (self.cfg.icons.size / dw) if dw else 1.0
             deaf_sy = (self.cfg.icons.size / dh) if dh else 1.0
 
-            await self.obs.set_scene_item_transform(
-                scene_name=self.scene_name,
-                scene_item_id=handles["mute"].scene_item_id,
-                x=ul.mute_x,
-                y=ul.mute_y,
-                scale_x=mute_sx,
-                scale_y=mute_sy,
+            transforms.append(
+                self.obs.set_scene_item_transform(
+                    scene_name=self.scene_name,
+                    scene_item_id=handles["mute"].scene_item_id,
+                    x=ul.mute_x,
+                    y=ul.mute_y,
+                    scale_x=mute_sx,
+                    scale_y=mute_sy,
+                )
             )
-            await self.obs.set_scene_item_transform(
-                scene_name=self.scene_name,
-                scene_item_id=handles["deaf"].scene_item_id,
-                x=ul.deaf_x,
-                y=ul.deaf_y,
-                scale_x=deaf_sx,
-                scale_y=deaf_sy,
+            transform_labels.append((uid, "mute"))
+            transforms.append(
+                self.obs.set_scene_item_transform(
+                    scene_name=self.scene_name,
+                    scene_item_id=handles["deaf"].scene_item_id,
+                    x=ul.deaf_x,
+                    y=ul.deaf_y,
+                    scale_x=deaf_sx,
+                    scale_y=deaf_sy,
+                )
             )
-
-            # Ensure icon ordering above avatar (best-effort).
+            transform_labels.append((uid, "deaf"))
+        # One failed transform must not cancel or hide the others.
+        results = await asyncio.gather(*transforms, return_exceptions=True)
+        for (uid, key), result in zip(transform_labels, results):
+            if isinstance(result, BaseException):
+                log.warning("Could not apply %s transform for %s: %s", key, uid, result)
+
+        # Ensure icon ordering above avatar (best-effort). The scene item list is fetched once and
+        # kept in sync locally as items are moved; it is re-fetched only after a failed move.
+        order: list[int] | None = None
+        for user in self.cfg.users:
+            uid = user.discord_id
+            handles = self._scene_items.get(uid)
+            if not handles:
+                continue
             try:
                 avatar_id = handles["avatar"].scene_item_id
+                talking_id = handles["talking"].scene_item_id
                 mute_id = handles["mute"].scene_item_id
                 deaf_id = handles["deaf"].scene_item_id
 
-                items = await self.obs.get_scene_item_list(self.scene_name)
-                id_to_index = {int(it.get("sceneItemId")): idx for idx, it in enumerate(items) if "sceneItemId" in it}
-                avatar_idx = id_to_index.get(int(avatar_id))
-                if avatar_idx is None:
+                if order is None:
+                    items = await self.obs.get_scene_item_list(self.scene_name)
+                    order = [int(it["sceneItemId"]) for it in items if "sceneItemId" in it]
+                if avatar_id not in order:
                     continue
+                stack = [mute_id, deaf_id, avatar_id, talking_id]
+                if mute_id in order and order[order.index(mute_id) : order.index(mute_id) + 4] == stack:
+                    # Already stacked (fresh sources, or ordered on a previous run).
+                    continue
+                avatar_idx = order.index(avatar_id)
 
-                # Insert into the list around the avatar: mute, then deaf, then avatar.
-                await self.obs.set_scene_item_index(self.scene_name, avatar_id, avatar_idx)
-                await self.obs.set_scene_item_index(self.scene_name, deaf_id, avatar_idx)
-                await self.obs.set_scene_item_index(self.scene_name, mute_id, avatar_idx)
+                # Insert into the list around the avatar: mute, then deaf, then avatar, then talking.
+                # Each move depends on the previous one, so these stay sequential.
+                for item_id in (talking_id, avatar_id, deaf_id, mute_id):
+                    await self.obs.set_scene_item_index(self.scene_name, item_id, avatar_idx)
+                    _move_item(order, item_id, avatar_idx)
             except Exception as e:
+                order = None
                 log.debug("Could not enforce icon ordering for %s: %s", uid, e)
 
     async def _fade_or_toggle(self, handle: SceneItemHandle, show: bool) -> None:
@@ -178,9 +235,57 @@ class PNGTuberBotRuntime:
         except ObsError:
             await self.obs.set_scene_item_enabled(handle.scene_name, handle.scene_item_id, show)
 
+    def _swap_requests(self, handles: dict[str, SceneItemHandle], talking: bool) -> list[tuple[str, dict[str, Any]]]:
+        # Show the new image before hiding the old one (serial batch), so no frame has neither.
+        shown, hidden = (handles["talking"], handles["avatar"]) if talking else (handles["avatar"], handles["talking"])
+        return [
+            self.obs.enabled_payload(self.scene_name, shown.scene_item_id, True),
+            self.obs.enabled_payload(self.scene_name, hidden.scene_item_id, False),
+        ]
+
+    async def _show_talking(self, user_id: int, handles: dict[str, SceneItemHandle], talking: bool) -> None:
+        st = self._user_state[user_id]
+        if st.talking_shown == talking:
+            return
+        # Record before awaiting so a concurrent event compares against the latest request.
+        st.talking_shown = talking
+        try:
+            await self.obs.request_batch(self._swap_requests(handles, talking))
+        except Exception:
+            st.talking_shown = None
+            raise
+
+    async def _set_icons(
+        self,
+        user_id: int,
+        handles: dict[str, SceneItemHandle],
+        mute: bool,
+        deaf: bool,
+        force_idle: bool = False,
+    ) -> None:
+        """Send only the icon toggles (and idle swap) that differ from what OBS last got, as one batch."""
+        st = self._user_state[user_id]
+        reqs: list[tuple[str, dict[str, Any]]] = []
+        if st.mute_shown != mute:
+            st.mute_shown = mute
+            reqs.append(self.obs.enabled_payload(self.scene_name, handles["mute"].scene_item_id, mute))
+        if st.deaf_shown != deaf:
+            st.deaf_shown = deaf
+            reqs.append(self.obs.enabled_payload(self.scene_name, handles["deaf"].scene_item_id, deaf))
+        if force_idle and st.talking_shown is not False:
+            st.talking_shown = False
+            reqs.extend(self._swap_requests(handles, False))
+        if not reqs:
+            return
+        try:
+            await self.obs.request_batch(reqs)
+        except Exception:
+            st.talking_shown = st.mute_shown = st.deaf_shown = None
+            raise
+
     async def on_presence_change(self, change: VoicePresenceChange) -> None:
         uid = change.user_id
-        if uid not in self.users_by_id:
+        if uid not in self._tracked_ids:
             return
 
         st = self._user_state[uid]
@@ -190,29 +295,34 @@ class PNGTuberBotRuntime:
         if not handles:
             return
 
-        # Always reset avatar to idle on join/leave.
-        await self.obs.set_image_file(self._avatar_source(uid), self.users_by_id[uid].idle_animation)
-
+        # Always reset avatar to idle on join/leave. Only the idle item is ever faded; the talking
+        # item is just toggled, so its opacity filter never comes into play.
         if change.joined:
+            if st.talking_shown is not False:
+                st.talking_shown = False
+                await self.obs.set_scene_item_enabled(self.scene_name, handles["talking"].scene_item_id, False)
             await self._fade_or_toggle(handles["avatar"], True)
 
             # Apply current mute/deaf state on join.
-            await self.obs.set_scene_item_enabled(self.scene_name, handles["mute"].scene_item_id, st.muted)
-            await self.obs.set_scene_item_enabled(self.scene_name, handles["deaf"].scene_item_id, st.deafened)
+            await self._set_icons(uid, handles, st.muted, st.deafened)
         else:
             # Hide everything on leave.
+            await self._show_talking(uid, handles, False)
             await self._fade_or_toggle(handles["avatar"], False)
-            await self.obs.set_scene_item_enabled(self.scene_name, handles["mute"].scene_item_id, False)
-            await self.obs.set_scene_item_enabled(self.scene_name, handles["deaf"].scene_item_id, False)
+            await self._set_icons(uid, handles, False, False)
 
     async def on_mute_deaf_change(self, state: VoiceMuteDeafState) -> None:
         uid = state.user_id
-        if uid not in self.users_by_id:
+        if uid not in self._tracked_ids:
             return
 
         st = self._user_state[uid]
-        st.muted = bool(state.muted)
-        st.deafened = bool(state.deafened)
+        muted, deafened = bool(state.muted), bool(state.deafened)
+        if (muted, deafened) == (st.muted, st.deafened):
+            # Voice state updates also fire for video, streaming, etc.
+            return
+        st.muted = muted
+        st.deafened = deafened
 
         handles = self._scene_items.get(uid)
         if not handles:
@@ -222,17 +332,53 @@ class PNGTuberBotRuntime:
             # Cache only; don't show icons while hidden.
             return
 
-        await self.obs.set_scene_item_enabled(self.scene_name, handles["mute"].scene_item_id, st.muted)
-        await self.obs.set_scene_item_enabled(self.scene_name, handles["deaf"].scene_item_id, st.deafened)
-
         # If muted and we don't allow talking while muted, force idle.
-        if st.muted and not self.cfg.advanced.talking_while_muted:
-            await self.obs.set_image_file(self._avatar_source(uid), self.users_by_id[uid].idle_animation)
+        force_idle = st.muted and not self.cfg.advanced.talking_while_muted
+        await self._set_icons(uid, handles, st.muted, st.deafened, force_idle)
 
     async def on_speaking_change(self, user_id: int, speaking: bool) -> None:
-        if user_id not in self.users_by_id:
+        if user_id not in self._tracked_ids:
             return
 
+        st = self._user_state[user_id]
+        if st.speaking_timer is not None:
+            st.speaking_pending = speaking
+            return
+        st.speaking_timer = asyncio.get_running_loop().call_later(
+            _SPEAKING_DEBOUNCE_S, self._close_speaking_window, user_id
+        )
+        st.speaking_applied = speaking
+        await self._apply_speaking(user_id, speaking)
+
+    def _close_speaking_window(self, user_id: int) -> None:
+        st = self._user_state[user_id]
+        if st.speaking_task is not None and not st.speaking_task.done():
+            # Previous trailing apply still in flight: keep collecting edges until it lands.
+            st.speaking_timer = asyncio.get_running_loop().call_later(
+                _SPEAKING_DEBOUNCE_S, self._close_speaking_window, user_id
+            )
+            return
+        st.speaking_timer = None
+        speaking, st.speaking_pending = st.speaking_pending, None
+        if speaking is not None and speaking != st.speaking_applied:
+            st.speaking_task = asyncio.create_task(self._apply_trailing_speaking(user_id, speaking))
+
+    def _cancel_speaking_debounce(self) -> None:
+        for st in self._user_state.values():
+            if st.speaking_timer is not None:
+                st.speaking_timer.cancel()
+                st.speaking_timer = None
+            if st.speaking_task is not None:
+                st.speaking_task.cancel()
+                st.speaking_task = None
+
+    async def _apply_trailing_speaking(self, user_id: int, speaking: bool) -> None:
+        try:
+            await self.on_speaking_change(user_id, speaking)
+        except Exception as e:
+            log.debug("Could not apply speaking state for %s: %s", user_id, e)
+
+    async def _apply_speaking(self, user_id: int, speaking: bool) -> None:
         st = self._user_state[user_id]
         if not st.present:
             return
@@ -240,8 +386,10 @@ class PNGTuberBotRuntime:
         if st.muted and not self.cfg.advanced.talking_while_muted:
             speaking = False
 
-        path = self.users_by_id[user_id].talking_animation if speaking else self.users_by_id[user_id].idle_animation
-        await self.obs.set_image_file(self._avatar_source(user_id), path)
+        handles = self._scene_items.get(user_id)
+        if not handles:
+            return
+        await self._show_talking(user_id, handles, speaking)
 
     async def _on_ready_hook(self, client: PNGTuberDiscordClient) -> None:
         # Join voice for listening, then start RMS-based speaking detection.
@@ -269,11 +417,10 @@ class PNGTuberBotRuntime:
     async def run(self) -> None:
         await self.setup_obs_sources()
 
-        tracked = set(self.users_by_id.keys())
         self.discord = PNGTuberDiscordClient(
             guild_id=self.cfg.discord.guild_id,
             voice_channel_id=self.cfg.discord.voice_channel_id,
-            tracked_user_ids=tracked,
+            tracked_user_ids=self._tracked_ids,
             on_presence_change=self.on_presence_change,
             on_mute_deaf_change=self.on_mute_deaf_change,
             on_ready_hook=self._on_ready_hook,
@@ -288,6 +435,8 @@ class PNGTuberBotRuntime:
             except Exception:
                 pass
 
+            self._cancel_speaking_debounce()
+
             try:
                 if self._voice_client:
                     await self._voice_client.disconnect(force=True)  # type: ignore[func-returns-value]
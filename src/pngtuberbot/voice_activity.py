@@ -2,23 +2,34 @@ from __future__ import annotations
 
 import asyncio
 import audioop
+import heapq
 import logging
+import queue
 import threading
 import time
+from collections import deque
 from dataclasses import dataclass
 from typing import Awaitable, Callable, Optional
 
 import discord
 from discord.ext.voice_recv import AudioSink, VoiceData, VoiceRecvClient
 
+try:
+    import numpy as np
+except ImportError:  # Optional: audioop is used instead.
+    np = None
+
 
 log = logging.getLogger(__name__)
 
 
 SpeakingCallback = Callable[[int, bool], Awaitable[None]]  # (user_id, speaking)
 
+# Frames buffered between the packet router and the RMS worker (~5 s of audio for one speaker).
+_MAX_PENDING_FRAMES = 256
+
 
-@dataclass
+@dataclass(slots=True)
 class _UserSpeakingState:
     speaking: bool = False
     last_loud_t: float = 0.0  # monotonic time
@@ -29,7 +40,8 @@ class RmsVoiceActivityDetector:
     Very small VAD-ish detector: compute RMS of PCM frames and apply a threshold + hangover.
 
     Important: `AudioSink.write()` is called from a background thread (packet router), so any
-    async side effects must be scheduled onto the asyncio event loop.
+    async side effects must be scheduled onto the asyncio event loop. Frames are handed over with
+    `submit()` and analysed on a worker thread so the router is never held up by the RMS math.
     """
 
     def __init__(
@@ -39,16 +51,26 @@ class RmsVoiceActivityDetector:
         hangover_ms: int,
         loop: asyncio.AbstractEventLoop,
         on_speaking_change: SpeakingCallback,
-        tick_interval_s: float = 0.05,
     ) -> None:
         self.threshold = float(threshold)
+        self._threshold_sq = (self.threshold * 32768.0) ** 2
         self.hangover_s = max(0.0, hangover_ms / 1000.0)
         self.loop = loop
         self.on_speaking_change = on_speaking_change
-        self.tick_interval_s = tick_interval_s
 
         self._lock = threading.Lock()
         self._states: dict[int, _UserSpeakingState] = {}
+        # Min-heap of (hangover deadline, user_id) for speaking users; entries are re-checked
+        # against last_loud_t when they come due, so only the start edge pushes one. Pushed by
+        # _drain after the start has been dispatched, so a stop can never overtake its start.
+        self._deadlines: list[tuple[float, int]] = []
+        self._wake = asyncio.Event()
+        # Speaking starts reported by the sink thread, drained on the loop in one callback per burst.
+        self._pending: deque[int] = deque()
+        self._drain_scheduled = False
+        self._notify_tasks: set[asyncio.Task[None]] = set()
+        self._frames: queue.Queue[tuple[int, bytes] | None] = queue.Queue(maxsize=_MAX_PENDING_FRAMES)
+        self._worker: threading.Thread | None = None
         self._task: asyncio.Task[None] | None = None
         self._closed = False
 
@@ -57,58 +79,143 @@ class RmsVoiceActivityDetector:
         if self._task:
             self._task.cancel()
             self._task = None
+        for task in list(self._notify_tasks):
+            task.cancel()
+        if self._worker:
+            self._enqueue(None)
+            self._worker = None
 
     def start(self) -> None:
         if self._task or self._closed:
             return
         self._task = self.loop.create_task(self._tick_loop(), name="pngtuberbot:voice_activity_tick")
+        self._worker = threading.Thread(target=self._worker_loop, name="pngtuberbot:voice_activity_pcm", daemon=True)
+        self._worker.start()
 
-    def _schedule(self, coro: Awaitable[None]) -> None:
-        # Called from non-async threads (sink write).
+    def submit(self, user_id: int, pcm: bytes) -> None:
+        """Queue a PCM frame for the worker thread (called from the packet router)."""
+        if self._closed or not pcm:
+            return
+        if self._worker is None:
+            self.on_pcm(user_id, pcm)
+            return
+        self._enqueue((user_id, pcm))
+
+    def _enqueue(self, item: tuple[int, bytes] | None) -> None:
+        # VAD tolerates loss: when the worker falls behind, drop the oldest frame.
+        while True:
+            try:
+                self._frames.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self._frames.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def _worker_loop(self) -> None:
+        while True:
+            item = self._frames.get()
+            if item is None or self._closed:
+                return
+            self.on_pcm(*item)
+
+    def _drain(self) -> None:
+        # Runs on the event loop (scheduled from the sink thread by on_pcm).
+        with self._lock:
+            user_ids = list(self._pending)
+            self._pending.clear()
+            self._drain_scheduled = False
+        if self._closed:
+            return
+        # Start tasks are created before the tick loop can see these users: tasks run in creation
+        # order, so each start reaches the handler ahead of any stop for the same user.
+        for user_id in user_ids:
+            task = self.loop.create_task(self._notify_started(user_id))
+            self._notify_tasks.add(task)
+            task.add_done_callback(self._notify_tasks.discard)
+        with self._lock:
+            for user_id in user_ids:
+                st = self._states[user_id]
+                heapq.heappush(self._deadlines, (st.last_loud_t + self.hangover_s, user_id))
+        self._wake.set()
+
+    async def _notify_started(self, user_id: int) -> None:
         try:
-            asyncio.run_coroutine_threadsafe(coro, self.loop)
-        except RuntimeError:
-            # Loop is probably closing.
-            pass
+            await self.on_speaking_change(user_id, True)
+        except Exception as e:
+            log.debug("Speaking start handler failed for %s: %s", user_id, e)
 
     def on_pcm(self, user_id: int, pcm: bytes) -> None:
         if self._closed or not pcm:
             return
 
-        # audioop.rms returns 0..~32768 for 16-bit audio.
+        # Compare in raw 16-bit units, squared: sum(x^2) >= (threshold * 32768)^2 * n.
         try:
-            rms = audioop.rms(pcm, 2) / 32768.0
+            if np is not None:
+                a = np.frombuffer(pcm, dtype="<i2")
+                loud = int(np.dot(a, a.astype(np.int64))) >= self._threshold_sq * len(a)
+            else:
+                rms = audioop.rms(pcm, 2)
+                loud = rms * rms >= self._threshold_sq
         except Exception:
             return
 
+        # If below threshold, don't flip immediately. Tick loop handles hangover timeout.
+        if not loud:
+            return
+
         now = time.monotonic()
 
+        # Keep the critical section to the state update; wake the loop after releasing the lock.
         with self._lock:
             st = self._states.get(user_id)
             if st is None:
-                st = _UserSpeakingState(speaking=False, last_loud_t=0.0)
-                self._states[user_id] = st
+                st = self._states[user_id] = _UserSpeakingState()
+            st.last_loud_t = now
+            if st.speaking:
+                return
+            st.speaking = True
+            self._pending.append(user_id)
+            if self._drain_scheduled:
+                return
+            self._drain_scheduled = True
 
-            if rms >= self.threshold:
-                st.last_loud_t = now
-                if not st.speaking:
-                    st.speaking = True
-                    self._schedule(self.on_speaking_change(user_id, True))
-            # If below threshold, don't flip immediately. Tick loop handles hangover timeout.
+        try:
+            self.loop.call_soon_threadsafe(self._drain)
+        except RuntimeError:
+            # Loop is probably closing.
+            pass
 
     async def _tick_loop(self) -> None:
         try:
             while not self._closed:
-                await asyncio.sleep(self.tick_interval_s)
+                with self._lock:
+                    deadline = self._deadlines[0][0] if self._deadlines else None
+                if deadline is None:
+                    # Nobody is speaking: sleep until on_pcm reports a start.
+                    await self._wake.wait()
+                    self._wake.clear()
+                    continue
+                # Deadlines are pushed in increasing order, so nothing can come due before this one.
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
                 now = time.monotonic()
                 to_stop: list[int] = []
                 with self._lock:
-                    for user_id, st in self._states.items():
-                        if not st.speaking:
+                    while self._deadlines and self._deadlines[0][0] <= now:
+                        _, user_id = heapq.heappop(self._deadlines)
+                        st = self._states.get(user_id)
+                        if st is None or not st.speaking:
                             continue
-                        if now - st.last_loud_t > self.hangover_s:
+                        expires = st.last_loud_t + self.hangover_s
+                        if now >= expires:
                             st.speaking = False
                             to_stop.append(user_id)
+                        else:
+                            heapq.heappush(self._deadlines, (expires, user_id))
 
                 for user_id in to_stop:
                     await self.on_speaking_change(user_id, False)
@@ -125,12 +232,10 @@ class RmsAudioSink(AudioSink):
         return False
 
     def write(self, user: Optional[discord.abc.User], data: VoiceData):
-        if user is None:
-            return
-        pcm = data.pcm
-        if not pcm:
+        if user is None or not (pcm := data.pcm):
             return
-        self._detector.on_pcm(int(user.id), pcm)
+        # discord snowflake ids are already ints.
+        self._detector.submit(user.id, pcm)
 
     def cleanup(self):
         # Detector is owned externally.
@@ -0,0 +1,88 @@
+import asyncio
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from pngtuberbot import state  # noqa: E402
+from pngtuberbot.config import load_config  # noqa: E402
+
+_USER_ID = 123456789012345678
+
+_CONFIG = f"""
+discord:
+  bot_token: token
+  guild_id: 223456789012345678
+  voice_channel_id: 323456789012345678
+obs:
+  websocket_host: localhost
+  websocket_port: 4455
+  scene_name: Gaming
+users:
+  - discord_id: {_USER_ID}
+    name: Alice
+    idle_animation: idle.png
+    talking_animation: talk.png
+layout:
+  mode: simple
+  positions:
+    slot_1: [100, 100]
+    slot_2: [300, 100]
+    slot_3: [500, 100]
+    slot_4: [100, 400]
+    slot_5: [300, 400]
+    slot_6: [500, 400]
+icons:
+  mute_default: mute.png
+  deaf_default: deaf.png
+  size: 64
+advanced:
+  animation_duration: 0.5
+  reconnect_attempts: 3
+  talking_threshold: 0.02
+  talking_hangover_ms: 300
+"""
+
+
+class _RecordingRuntime(state.PNGTuberBotRuntime):
+    def __init__(self, cfg) -> None:
+        super().__init__(cfg)
+        self.applied: list[bool] = []
+
+    async def _apply_speaking(self, user_id: int, speaking: bool) -> None:
+        self.applied.append(speaking)
+
+
+class SpeakingDebounceTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        with tempfile.TemporaryDirectory() as d:
+            path = Path(d) / "config.yaml"
+            path.write_text(_CONFIG, encoding="utf-8")
+            self.rt = _RecordingRuntime(load_config(path))
+
+    async def _settle(self) -> None:
+        await asyncio.sleep(state._SPEAKING_DEBOUNCE_S * 3)
+
+    async def test_on_off_on_in_one_window_applies_once(self) -> None:
+        for speaking in (True, False, True):
+            await self.rt.on_speaking_change(_USER_ID, speaking)
+        await self._settle()
+        self.assertEqual(self.rt.applied, [True])
+
+    async def test_on_off_in_one_window_applies_trailing_edge(self) -> None:
+        for speaking in (True, False):
+            await self.rt.on_speaking_change(_USER_ID, speaking)
+        await self._settle()
+        self.assertEqual(self.rt.applied, [True, False])
+
+    async def test_edges_in_separate_windows_all_apply(self) -> None:
+        for speaking in (True, False, True):
+            await self.rt.on_speaking_change(_USER_ID, speaking)
+            await self._settle()
+        self.assertEqual(self.rt.applied, [True, False, True])
+
+
+if __name__ == "__main__":
+    unittest.main()